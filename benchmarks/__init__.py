@@ -0,0 +1,4 @@
+"""
+Benchmarks for the ETL pipeline.
+Run individual modules with `python -m benchmarks.<module>`.
+"""
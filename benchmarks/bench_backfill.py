@@ -0,0 +1,50 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.bench_transform import RATE_CONVERSION, make_raw_frame
+from utils.backfill import backfill
+
+
+def write_snapshots(snapshot_dir, snapshots, rows):
+    os.makedirs(snapshot_dir)
+    raw = make_raw_frame(rows)
+    for day in range(snapshots):
+        # Same names and compression as the raw archive written by main.py
+        name = f"fashion_data_202505{day % 28 + 1:02d}_{day:06d}.csv.gz"
+        raw.to_csv(os.path.join(snapshot_dir, name), index=False)
+
+
+def run(snapshots=16, rows=50_000, workers=None):
+    workers = workers or sorted({1, 2, os.cpu_count() or 1})
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot_dir = os.path.join(workdir, "raw_data.csv")
+        write_snapshots(snapshot_dir, snapshots, rows)
+
+        for count in workers:
+            output_dir = os.path.join(workdir, f"transformed_{count}")
+            state_path = os.path.join(workdir, f"backfill_{count}.json")
+            # Progress lines would drown the results
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                backfill(snapshot_dir, output_dir, RATE_CONVERSION, state_path, workers=count)
+                elapsed = time.perf_counter() - start
+            results[count] = elapsed
+            print(f"{count:>3} workers  {elapsed:>7.2f}s  "
+                  f"{snapshots * rows / elapsed:>12,.0f} rows/sec  "
+                  f"{results[workers[0]] / elapsed:.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Backfill time against worker count")
+    arg_parser.add_argument("--snapshots", type=int, default=16)
+    arg_parser.add_argument("--rows", type=int, default=50_000)
+    arg_parser.add_argument("--workers", type=int, nargs="*")
+    args = arg_parser.parse_args()
+    run(args.snapshots, args.rows, args.workers)
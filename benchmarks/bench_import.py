@@ -0,0 +1,42 @@
+import argparse
+import subprocess
+import sys
+
+# Modules a plain CSV run has no use for; the sink registry keeps them out of startup
+HEAVY_MODULES = ("sqlalchemy", "googleapiclient.discovery", "google.oauth2.service_account")
+
+
+def import_times(module):
+    # -X importtime reports "self | cumulative | name" in microseconds on stderr
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def run(module="main", repeat=5, top=10):
+    # Keep the fastest of several runs; the first one also pays for cold file caches
+    samples = [import_times(module) for _ in range(repeat)]
+    best = min(samples, key=lambda times: times[module])
+
+    print(f"import {module}: {best[module] * 1000:.0f} ms (best of {repeat})")
+    for name, seconds in sorted(best.items(), key=lambda item: -item[1])[1:top + 1]:
+        print(f"  {name:<50} {seconds * 1000:>8.1f} ms")
+    loaded = [name for name in HEAVY_MODULES if name in best]
+    print(f"Heavy sink dependencies imported: {', '.join(loaded) or 'none'}")
+    return best
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Measure pipeline startup import time")
+    arg_parser.add_argument("--module", default="main")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--top", type=int, default=10)
+    args = arg_parser.parse_args()
+    run(args.module, args.repeat, args.top)
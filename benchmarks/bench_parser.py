@@ -0,0 +1,97 @@
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic_site import render_catalog_page
+from utils.extract import parse_page, parse_page_rows
+
+
+def legacy_parse_product_info(card):
+    # The pre-single-pass implementation, kept here as the baseline
+    title = card.find('h3', class_='product-title')
+    price_element = card.find(['span', 'p'], class_='price')
+    rating_element = card.find('p', string=lambda text: text and 'Rating:' in text)
+    colors_element = card.find('p', string=lambda text: text and 'Colors' in text)
+    size_element = card.find('p', string=lambda text: text and 'Size:' in text)
+    gender_element = card.find('p', string=lambda text: text and 'Gender:' in text)
+
+    return {
+        'Title': title.text.strip() if title else None,
+        'Price': price_element.text.strip() if price_element else None,
+        'Rating': rating_element.text.strip() if rating_element else None,
+        'Colors': colors_element.text.strip() if colors_element else None,
+        'Size': size_element.text.strip() if size_element else None,
+        'Gender': gender_element.text.strip() if gender_element else None,
+        'timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
+    }
+
+
+def legacy_parse_page(content):
+    soup = BeautifulSoup(content, "html.parser")
+    return [legacy_parse_product_info(card) for card in soup.find_all('div', class_='collection-card')]
+
+
+def strip_timestamps(products):
+    return [{k: v for k, v in p.items() if k != 'timestamp'} for p in products]
+
+
+def time_parser(parse, pages):
+    start = time.perf_counter()
+    cards = sum(len(parse(page)) for page in pages)
+    elapsed = time.perf_counter() - start
+    return cards, elapsed
+
+
+def run(pages=50):
+    corpus = [render_catalog_page(page, pages) for page in range(1, pages + 1)]
+    candidates = {
+        "legacy (html.parser, six finds per card)": legacy_parse_page,
+        "single-pass (html.parser + strainer)": lambda content: parse_page(content, "html.parser")[1],
+        "single-pass (lxml + strainer)": lambda content: parse_page(content, "lxml")[1],
+    }
+
+    # Every candidate must produce exactly the baseline rows before it is timed
+    reference = [strip_timestamps(legacy_parse_page(page)) for page in corpus]
+    for name, parse in candidates.items():
+        produced = [strip_timestamps(parse(page)) for page in corpus]
+        if produced != reference:
+            raise AssertionError(f"{name} output differs from the legacy parser")
+
+    results = {}
+    for name, parse in candidates.items():
+        cards, elapsed = time_parser(parse, corpus)
+        results[name] = cards / elapsed
+        print(f"{name:<45} {cards / elapsed:>10,.0f} cards/sec")
+    return results
+
+
+def run_process_pool(pages=200, workers=(1, 2, 4, 8), parser="lxml"):
+    corpus = [render_catalog_page(page, pages) for page in range(1, pages + 1)]
+    results = {}
+
+    for count in workers:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=count, mp_context=context) as pool:
+            # Warm the workers up so process start-up is not measured
+            list(pool.map(parse_page_rows, corpus[:count], [parser] * count))
+
+            start = time.perf_counter()
+            cards = sum(len(rows) for rows in pool.map(parse_page_rows, corpus, [parser] * len(corpus)))
+            elapsed = time.perf_counter() - start
+
+        results[count] = cards / elapsed
+        print(f"process pool, {count} workers ({parser}){'':<14} {cards / elapsed:>10,.0f} cards/sec")
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark card parsing throughput")
+    arg_parser.add_argument("--pages", type=int, default=50)
+    arg_parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    args = arg_parser.parse_args()
+    run(args.pages)
+    run_process_pool(args.pages * 4, args.workers)
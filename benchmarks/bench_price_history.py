@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.price_history import PriceHistory
+
+
+def make_run(day, products, rng):
+    titles = [f"Product {index}" for index in range(products)]
+    start = pd.Timestamp("2025-01-01T17:00:00") + pd.Timedelta(days=day)
+    return pd.DataFrame({
+        "Title": titles,
+        "Price": rng.uniform(10, 500, products).round(2) * 16000,
+        "Rating": rng.uniform(1, 5, products).round(1),
+        "timestamp": (start + pd.to_timedelta(np.arange(products), unit="ms"))
+        .strftime("%Y-%m-%dT%H:%M:%S.%f")
+    })
+
+
+def timed_query(query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = query()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def run(runs=1000, products=1000, repeat=20):
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as workdir:
+        with PriceHistory(os.path.join(workdir, "price_history.db")) as history:
+            ingest = 0.0
+            with contextlib.redirect_stdout(io.StringIO()):
+                for day in range(runs):
+                    scraped = make_run(day, products, rng)
+                    start = time.perf_counter()
+                    history.record_run(scraped)
+                    ingest += time.perf_counter() - start
+            print(f"Recorded {runs * products:,} observations in {ingest:.1f}s "
+                  f"({runs * products / ingest:,.0f} rows/sec)")
+
+            run_ids = history.runs()["run_id"].tolist()
+            queries = {
+                "price_series (one product, all runs)": lambda: history.price_series("Product 500"),
+                "price_series (one product, 30 days)": lambda: history.price_series(
+                    "Product 500", start="2025-02-01", end="2025-03-02"),
+                "biggest_changes (last two runs)": lambda: history.biggest_changes(),
+                "biggest_changes (first vs last run)": lambda: history.biggest_changes(
+                    run_ids[0], run_ids[-1]),
+                "latest_prices (every product)": history.latest_prices,
+            }
+            results = {}
+            for name, query in queries.items():
+                result, seconds = timed_query(query, repeat)
+                results[name] = seconds
+                print(f"{name:<40} {seconds * 1000:>8.2f} ms  ({len(result)} rows)")
+            return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Price history ingest and query latency")
+    arg_parser.add_argument("--runs", type=int, default=1000)
+    arg_parser.add_argument("--products", type=int, default=1000)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+    run(args.runs, args.products, args.repeat)
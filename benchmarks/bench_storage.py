@@ -0,0 +1,67 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_transform import RATE_CONVERSION, make_raw_frame
+from utils.load import read_parquet_dataset, save_to_parquet
+from utils.transform import process_dataframe
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def make_runs(runs, rows):
+    # One processed frame per daily scrape
+    processed = process_dataframe(make_raw_frame(rows), RATE_CONVERSION)
+    for day in range(runs):
+        yield processed.assign(timestamp=f"2025-05-{day + 1:02d}T17:17:52.126699")
+
+
+def run(runs=14, rows=100_000):
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_dir = os.path.join(workdir, "products.csv")
+        parquet_dir = os.path.join(workdir, "products.parquet")
+
+        os.makedirs(csv_dir)
+        for index, frame in enumerate(make_runs(runs, rows)):
+            # Same layout as save_to_csv, which names files by the second and
+            # would overwrite runs written back to back
+            frame.to_csv(os.path.join(csv_dir, f"fashion_data_{index:03d}.csv"), index=False)
+            save_to_parquet(frame, parquet_dir)
+
+        # Typical analyst query: prices over the last week
+        start = time.perf_counter()
+        csv_frames = [pd.read_csv(os.path.join(csv_dir, name), usecols=["Title", "Price", "timestamp"])
+                      for name in sorted(os.listdir(csv_dir))]
+        csv_result = pd.concat(csv_frames, ignore_index=True)
+        csv_result = csv_result[csv_result["timestamp"] >= f"2025-05-{runs - 6:02d}"]
+        csv_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parquet_result = read_parquet_dataset(
+            parquet_dir, columns=["Title", "Price"], start_date=f"2025-05-{runs - 6:02d}")
+        parquet_elapsed = time.perf_counter() - start
+
+        assert len(csv_result) == len(parquet_result)
+
+        results = {
+            "csv": {"bytes": directory_size(csv_dir), "seconds": csv_elapsed},
+            "parquet": {"bytes": directory_size(parquet_dir), "seconds": parquet_elapsed},
+        }
+        for name, result in results.items():
+            print(f"{name:<8} {result['bytes'] / 1e6:>8.1f} MB on disk   "
+                  f"last-week scan {result['seconds']:>6.2f}s")
+        return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Compare CSV snapshots with the Parquet dataset")
+    arg_parser.add_argument("--runs", type=int, default=14)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+    run(args.runs, args.rows)
@@ -0,0 +1,130 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.transform import (
+    clean_price,
+    clean_price_series,
+    clean_rating,
+    clean_rating_series,
+    extract_colors,
+    extract_colors_series,
+    extract_gender,
+    extract_gender_series,
+    extract_sizes,
+    extract_sizes_series,
+    process_dataframe
+)
+
+# transform_data column -> (per-element reference helper, vectorized kernel)
+TRANSFORM_KERNELS = {
+    "Price": (clean_price, clean_price_series),
+    "Rating": (clean_rating, clean_rating_series),
+    "Colors": (extract_colors, extract_colors_series),
+    "Size": (extract_sizes, extract_sizes_series),
+    "Gender": (extract_gender, extract_gender_series),
+}
+
+RATE_CONVERSION = 16000.0
+
+
+def make_raw_frame(rows, seed=42):
+    # Synthetic scrape output with the same dirty patterns as the live site
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    kinds = np.array(["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Crewneck"])
+
+    titles = pd.Series(kinds[ids % len(kinds)]).str.cat(pd.Series(ids.astype(str)), sep=" ")
+    prices = pd.Series(rng.uniform(10, 500, rows).round(2).astype(str)).radd("$")
+    ratings = pd.Series(rng.uniform(1, 5, rows).round(1).astype(str)).radd("Rating: ⭐ ") + " / 5"
+    colors = pd.Series(rng.integers(1, 6, rows).astype(str)) + " Colors"
+    sizes = pd.Series(np.array(["S", "M", "L", "XL", "XXL"])[ids % 5]).radd("Size: ")
+    genders = pd.Series(np.array(["Men", "Women", "Unisex"])[ids % 3]).radd("Gender: ")
+
+    df = pd.DataFrame({
+        "Title": titles, "Price": prices, "Rating": ratings, "Colors": colors,
+        "Size": sizes, "Gender": genders,
+        "timestamp": "2025-05-14T17:17:52.126699"
+    })
+
+    dirty = rng.random(rows)
+    df.loc[dirty < 0.05, "Title"] = "Unknown Product"
+    df.loc[(dirty >= 0.05) & (dirty < 0.08), "Rating"] = "Rating: ⭐ Invalid Rating / 5"
+    df.loc[(dirty >= 0.08) & (dirty < 0.10), "Price"] = "Price Unavailable"
+    df.loc[(dirty >= 0.10) & (dirty < 0.11), "Gender"] = None
+    return df
+
+
+def legacy_process_dataframe(df, conversion_rate):
+    # The multi-pass implementation this benchmark compares against
+    processed_df = df.copy()
+    invalid_patterns = {
+        "Title": ["Unknown Product"],
+        "Rating": ["Invalid Rating / 5", "Not Rated"],
+        "Price": ["Price Unavailable", None]
+    }
+    processed_df.dropna(inplace=True)
+    processed_df.drop_duplicates(inplace=True)
+    for col, invalid_values in invalid_patterns.items():
+        if col in processed_df.columns:
+            processed_df = processed_df[~processed_df[col].isin(invalid_values)]
+    processed_df["Price"] = processed_df["Price"].str.replace(
+        r"[$,]", "", regex=True).astype(float).mul(conversion_rate).round(2)
+    processed_df["Rating"] = processed_df["Rating"].str.extract(r"([\d.]+)").astype(float)
+    processed_df["Colors"] = processed_df["Colors"].str.extract(r"(\d+)").astype(int)
+    processed_df["Size"] = processed_df["Size"].str.replace("Size: ", "", regex=False)
+    processed_df["Gender"] = processed_df["Gender"].str.replace("Gender: ", "", regex=False)
+    processed_df.reset_index(drop=True, inplace=True)
+    return processed_df
+
+
+def time_call(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def run(rows=1_000_000):
+    raw = make_raw_frame(rows)
+    candidates = {
+        "legacy multi-pass": lambda df: legacy_process_dataframe(df, RATE_CONVERSION),
+        "process_dataframe": lambda df: process_dataframe(df, RATE_CONVERSION),
+    }
+
+    reference = None
+    results = {}
+    for name, func in candidates.items():
+        result, elapsed = time_call(func, raw)
+        if reference is None:
+            reference = result
+        else:
+            pd.testing.assert_frame_equal(result, reference)
+        results[name] = rows / elapsed
+        print(f"{name:<32} {elapsed:>7.2f}s {rows / elapsed:>12,.0f} rows/sec")
+    return results
+
+
+def run_transform_kernels(rows=1_000_000):
+    raw = make_raw_frame(rows)
+    # transform_data sees the "Colors: a, b" style the helpers were written for
+    raw["Colors"] = "Colors: Red, Blue, Green"
+
+    results = {}
+    for column, (helper, kernel) in TRANSFORM_KERNELS.items():
+        expected, apply_elapsed = time_call(lambda s: s.apply(helper), raw[column])
+        result, kernel_elapsed = time_call(kernel, raw[column])
+        pd.testing.assert_series_equal(result, expected)
+        results[column] = {"apply": rows / apply_elapsed, "vectorized": rows / kernel_elapsed}
+        print(f"{column:<8} apply {rows / apply_elapsed:>12,.0f} rows/sec   "
+              f"vectorized {rows / kernel_elapsed:>12,.0f} rows/sec")
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark process_dataframe throughput")
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+    run(args.rows)
+    run_transform_kernels(args.rows)
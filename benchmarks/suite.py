@@ -0,0 +1,151 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.synthetic_site import CARDS_PER_PAGE, SyntheticSite
+from utils.extract import close_session, scrape_product
+from utils.load import (
+    CsvChunkWriter,
+    dispose_engines,
+    save_to_csv,
+    save_to_database,
+    save_to_parquet,
+    save_to_postgresql_copy
+)
+from utils.transform import create_dataframe, process_dataframe, transform_data
+
+RATE_CONVERSION = 16000.0
+
+
+def timed(func, *args, **kwargs):
+    # The pipeline functions report progress on stdout; keep it out of the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scrape(site, concurrency, parser):
+    products, elapsed = timed(scrape_product, base_url=site.url, delay=0,
+                              concurrency=concurrency, parser=parser)
+    close_session()
+    if len(products) != site.total_pages * site.cards_per_page:
+        raise AssertionError(f"Scraped {len(products)} products from {site.total_pages} pages")
+    return products, {"pages_per_sec": site.total_pages / elapsed, "seconds": elapsed}
+
+
+def run_transforms(products):
+    raw = create_dataframe(products)
+    processed, process_elapsed = timed(process_dataframe, raw, RATE_CONVERSION)
+    transformed, transform_elapsed = timed(transform_data, products)
+    results = {
+        "process_dataframe": {"rows_per_sec": len(raw) / process_elapsed, "seconds": process_elapsed},
+        "transform_data": {"rows_per_sec": len(products) / transform_elapsed,
+                           "seconds": transform_elapsed},
+    }
+    return raw, processed, transformed, results
+
+
+def write_csv_chunks(df, filepath, compression, chunk_size=1000):
+    with CsvChunkWriter(filepath, compression) as writer:
+        for offset in range(0, len(df), chunk_size):
+            writer.write(df.iloc[offset:offset + chunk_size])
+
+
+def run_loaders(processed, transformed, workdir, postgres_url=None):
+    loaders = {
+        "csv": lambda: save_to_csv(processed, os.path.join(workdir, "csv")),
+        "csv_gzip_chunks": lambda: write_csv_chunks(
+            processed, os.path.join(workdir, "chunks.csv.gz"), "gzip"),
+        "parquet": lambda: save_to_parquet(processed, os.path.join(workdir, "parquet")),
+        "sqlite": lambda: save_to_database(transformed, os.path.join(workdir, "products.db")),
+    }
+    # Google Sheets is an external quota-limited API and is left out on purpose
+    if postgres_url:
+        loaders["postgresql_copy"] = lambda: save_to_postgresql_copy(
+            processed, postgres_url, "benchmark_products")
+
+    results = {}
+    for name, load in loaders.items():
+        _, elapsed = timed(load)
+        results[name] = {"rows_per_sec": len(processed) / elapsed, "seconds": elapsed}
+    dispose_engines()
+    return results
+
+
+def run(pages=100, cards_per_page=CARDS_PER_PAGE, concurrency=(1, 4), parser="lxml",
+        postgres_url=None):
+    results = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "catalog": {"pages": pages, "cards_per_page": cards_per_page, "parser": parser},
+        "scrape": {},
+    }
+
+    with SyntheticSite(pages, cards_per_page) as site:
+        for workers in concurrency:
+            products, results["scrape"][f"concurrency_{workers}"] = run_scrape(site, workers, parser)
+
+    _, processed, transformed, results["transform"] = run_transforms(products)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results["load"] = run_loaders(processed, transformed, workdir, postgres_url)
+    return results
+
+
+def print_results(results, baseline=None):
+    def rate(section, name):
+        value = results[section][name]
+        metric = "pages_per_sec" if section == "scrape" else "rows_per_sec"
+        line = f"{section + ' / ' + name:<40} {value[metric]:>12,.0f} {metric.replace('_per_sec', '/sec')}"
+        previous = (baseline or {}).get(section, {}).get(name)
+        if previous:
+            line += f"   ({value[metric] / previous[metric]:.2f}x vs {baseline.get('commit')})"
+        print(line)
+
+    for section in ("scrape", "transform", "load"):
+        for name in results[section]:
+            rate(section, name)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="End-to-end pipeline benchmarks against a synthetic Fashion Studio site")
+    arg_parser.add_argument("--pages", type=int, default=100)
+    arg_parser.add_argument("--cards-per-page", type=int, default=CARDS_PER_PAGE)
+    arg_parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4])
+    arg_parser.add_argument("--parser", default="lxml")
+    arg_parser.add_argument("--postgres-url", help="Also benchmark the COPY loader against this database")
+    arg_parser.add_argument("--output", default="benchmark_results.json",
+                            help="Where to write the results as JSON")
+    arg_parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = arg_parser.parse_args()
+
+    results = run(args.pages, args.cards_per_page, args.concurrency, args.parser, args.postgres_url)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
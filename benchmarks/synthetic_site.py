@@ -0,0 +1,146 @@
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CARDS_PER_PAGE = 20
+KINDS = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Crewneck"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+PAGE_PATH_PATTERN = re.compile(r"/(?:page(\d+)/?)?")
+
+
+def product_title(product_id):
+    return f"{KINDS[product_id % len(KINDS)]} {product_id}"
+
+
+def render_card(product_id, dirty_every=10):
+    title = product_title(product_id)
+    price = f'<div class="price-container"><span class="price">${10 + product_id % 490}.{product_id % 100:02d}</span></div>'
+    rating = f"Rating: ⭐ {1 + product_id % 4}.{product_id % 10} / 5"
+
+    # Every dirty_every-th card is one of the two broken cards the live site
+    # serves, which process_dataframe has to drop
+    if dirty_every and product_id % dirty_every == dirty_every - 1:
+        if (product_id // dirty_every) % 2 == 0:
+            title = "Unknown Product"
+            price = '<div class="price-container"><span class="price">$100.00</span></div>'
+            rating = "Rating: ⭐ Invalid Rating / 5"
+        else:
+            price = '<p class="price">Price Unavailable</p>'
+            rating = "Rating: Not Rated"
+
+    return f"""
+        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350?random={product_id}" class="collection-image" alt="{title}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{title}</h3>
+                {price}
+                <p style="font-size: 14px; color: #777;">{rating}</p>
+                <p style="font-size: 14px; color: #777;">{1 + product_id % 5} Colors</p>
+                <p style="font-size: 14px; color: #777;">Size: {SIZES[product_id % len(SIZES)]}</p>
+                <p style="font-size: 14px; color: #777;">Gender: {GENDERS[product_id % len(GENDERS)]}</p>
+            </div>
+        </div>"""
+
+
+def render_catalog_page(page, total_pages, cards_per_page=CARDS_PER_PAGE, dirty_every=10,
+                        pagination_window=1, link_last_page=True):
+    first_id = (page - 1) * cards_per_page
+    cards = "".join(render_card(first_id + i, dirty_every) for i in range(cards_per_page))
+
+    # Windowed pagination like the live site: the first page, the neighbours
+    # within pagination_window, optionally the last page, and Next
+    window = {1} | set(range(page - pagination_window, page + pagination_window + 1))
+    if link_last_page:
+        window.add(total_pages)
+    links = "".join(f'<li class="page-item"><a class="page-link" href="/page{n}">{n}</a></li>'
+                    for n in sorted(window & set(range(1, total_pages + 1))))
+    next_class = "page-item next disabled" if page == total_pages else "page-item next"
+    # Navigation and footer filler give pages the size of the real ones
+    nav = "".join(f'<li class="nav-item"><a class="nav-link" href="#s{i}">Section {i}</a></li>' for i in range(20))
+    footer = "".join(f"<p>Footer line {i} with some filler text.</p>" for i in range(30))
+    return f"""<!DOCTYPE html><html><head><title>Fashion Studio</title></head><body>
+    <nav><ul class="navbar-nav">{nav}</ul></nav>
+    <div class="container"><div id="collectionList" class="collection-grid">{cards}</div>
+    <ul class="pagination">{links}<li class="{next_class}"><a class="page-link" href="/page{page + 1}">Next</a></li></ul></div>
+    <footer>{footer}</footer></body></html>""".encode()
+
+
+class SyntheticSite:
+    # Local HTTP stand-in for Fashion Studio; pages are rendered up front so
+    # the server costs as little as possible while the client is measured.
+    # failures maps a path to a (status, Retry-After) answer given once, before
+    # the page itself is served
+    def __init__(self, total_pages, cards_per_page=CARDS_PER_PAGE, dirty_every=10,
+                 pagination_window=1, link_last_page=True, failures=None):
+        self.total_pages = total_pages
+        self.cards_per_page = cards_per_page
+        self.pages = {
+            page: render_catalog_page(page, total_pages, cards_per_page, dirty_every,
+                                      pagination_window, link_last_page)
+            for page in range(1, total_pages + 1)
+        }
+        self.failures = dict(failures or {})
+        self.requested = []
+        self._server = None
+
+    @property
+    def requests(self):
+        return len(self.requested)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                site.requested.append(self.path)
+                if self.path in site.failures:
+                    status, retry_after = site.failures.pop(self.path)
+                    self.send_response(status)
+                    if retry_after:
+                        self.send_header("Retry-After", retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                match = PAGE_PATH_PATTERN.fullmatch(self.path)
+                page = int(match.group(1) or 1) if match else None
+                body = site.pages.get(page)
+                if body is None:
+                    self.send_error(404)
+                    return
+                # Pages never change, so a conditional GET always comes back empty
+                etag = f'"page-{page}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
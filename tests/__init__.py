@@ -1,4 +1,21 @@
 """
 Test package for the ETL project.
-This empty file makes the tests directory a package so that modules can be properly imported.
+This file makes the tests directory a package so that modules can be properly imported,
+and holds helpers shared by several test modules.
 """
+import os
+
+import pandas as pd
+
+
+def write_raw_snapshot(directory, name, price):
+    os.makedirs(directory, exist_ok=True)
+    pd.DataFrame({
+        'Title': ['T-shirt 1', 'Unknown Product'],
+        'Price': [price, '$10.00'],
+        'Rating': ['Rating: ⭐ 4.5 / 5', 'Rating: ⭐ 4.0 / 5'],
+        'Colors': ['3 Colors', '3 Colors'],
+        'Size': ['Size: M', 'Size: L'],
+        'Gender': ['Gender: Men', 'Gender: Women'],
+        'timestamp': ['2025-05-14T17:18:48.000000'] * 2
+    }).to_csv(os.path.join(directory, name), index=False)
@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from tests import write_raw_snapshot
+from utils.backfill import backfill, load_backfill_state, output_name
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    raw_dir = tmp_path / "raw_data.csv"
+    raw_dir.mkdir()
+    write_raw_snapshot(raw_dir, "fashion_data_20250513_080000.csv.gz", "$1.00")
+    write_raw_snapshot(raw_dir, "fashion_data_20250514_171848.csv", "$2.00")
+    return {"raw": str(raw_dir), "output": str(tmp_path / "transformed"),
+            "state": str(tmp_path / "backfill.json")}
+
+
+def test_output_name_drops_compression_suffix():
+    assert output_name("raw/fashion_data_20250513_080000.csv.gz") == "fashion_data_20250513_080000.csv"
+    assert output_name("fashion_data_20250513_080000.csv") == "fashion_data_20250513_080000.csv"
+
+
+def test_backfill_transforms_every_snapshot_and_skips_done(snapshots):
+    loaded = []
+    summary = backfill(snapshots["raw"], snapshots["output"], 10000.0, snapshots["state"],
+                       sinks={'memory': lambda df: loaded.append(df["Price"].tolist())},
+                       workers=2, version="v1")
+
+    assert summary["processed"] == 2
+    assert sorted(os.listdir(snapshots["output"])) == [
+        "fashion_data_20250513_080000.csv", "fashion_data_20250514_171848.csv"]
+    latest = pd.read_csv(os.path.join(snapshots["output"], "fashion_data_20250514_171848.csv"))
+    assert latest["Price"].tolist() == [20000.0]
+    assert sorted(loaded) == [[10000.0], [20000.0]]
+    assert load_backfill_state(snapshots["state"])["fashion_data_20250513_080000.csv.gz"]["rows_out"] == 1
+
+    # Same version and unchanged sources: nothing to do
+    again = backfill(snapshots["raw"], snapshots["output"], 10000.0, snapshots["state"],
+                     version="v1")
+    assert again["processed"] == 0
+    assert again["skipped"] == 2
+
+    # A new version label processes everything again
+    rerun = backfill(snapshots["raw"], snapshots["output"], 12000.0, snapshots["state"],
+                     workers=1, version="v2")
+    assert rerun["processed"] == 2
+    latest = pd.read_csv(os.path.join(snapshots["output"], "fashion_data_20250514_171848.csv"))
+    assert latest["Price"].tolist() == [24000.0]
+
+
+def test_backfill_without_snapshots(tmp_path):
+    with pytest.raises(ValueError, match="No snapshots"):
+        backfill(str(tmp_path), str(tmp_path / "out"), 16000.0, str(tmp_path / "state.json"))
@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+from unittest.mock import patch
+
+import utils.extract
+from utils.checkpoint import ScrapeCheckpoint
+from utils.extract import close_session, scrape_product
+from tests.test_extract import fake_site, without_timestamps
+
+
+def failing_on(url_suffix):
+    real_fetch = utils.extract.fetch_webpage
+
+    def fetch(url, **kwargs):
+        if url.endswith(url_suffix):
+            raise ValueError(f"Failed to fetch {url} after 3 attempts")
+        return real_fetch(url, **kwargs)
+    return fetch
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_resumes_from_first_incomplete_page(fake_site, tmp_path, concurrency):
+    path = str(tmp_path / "checkpoint.jsonl")
+    try:
+        expected = scrape_product(delay=0, base_url=fake_site.url, concurrency=concurrency)
+
+        with patch("utils.extract.fetch_webpage", side_effect=failing_on("/page5")):
+            with pytest.raises(ValueError):
+                scrape_product(delay=0, base_url=fake_site.url, concurrency=concurrency,
+                               checkpoint=ScrapeCheckpoint(path))
+
+        fake_site.requested.clear()
+        resumed = scrape_product(delay=0, base_url=fake_site.url, concurrency=concurrency,
+                                 checkpoint=ScrapeCheckpoint(path))
+    finally:
+        close_session()
+
+    assert without_timestamps(resumed) == without_timestamps(expected)
+    assert sorted(fake_site.requested) == ["/page5", "/page6", "/page7"]
+    # A finished crawl leaves nothing to resume
+    assert not os.path.exists(path)
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = ScrapeCheckpoint(path)
+    checkpoint.open("http://site/", 1)
+    checkpoint.record(1, [{"Title": "Product 1-0"}], last_page=3)
+    checkpoint.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"page": 2, "products": [{"Ti')
+
+    resumed = ScrapeCheckpoint(path)
+    resumed.open("http://site/", 1)
+    resumed.record(2, [{"Title": "Product 2-0"}])
+    resumed.close()
+
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line.get("page") for line in lines] == [None, 1, 2]
+
+
+def test_checkpoint_from_another_crawl_is_discarded(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = ScrapeCheckpoint(path)
+    checkpoint.open("http://site/", 1)
+    checkpoint.record(1, [{"Title": "Product 1-0"}], last_page=3)
+    checkpoint.close()
+
+    other_site = ScrapeCheckpoint(path)
+    other_site.open("http://other-site/", 1)
+    assert other_site.get(1) is None
+    other_site.close()
+
+    with patch("utils.checkpoint.time.time", return_value=10 ** 12):
+        expired = ScrapeCheckpoint(path, max_age=3600)
+        expired.open("http://other-site/", 1)
+    assert not expired.resumed
+    expired.close()
@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+from utils.delta import (
+    classify_products,
+    fingerprint_products,
+    load_delta_state,
+    save_delta_state
+)
+
+
+@pytest.fixture
+def catalog():
+    return pd.DataFrame({
+        'Title': ['Hoodie 1', 'Pants 2', 'Jacket 3'],
+        'Price': [1600000.0, 3200000.0, 4800000.0],
+        'Rating': [4.5, 3.8, 4.1],
+        'Colors': [3, 3, 5],
+        'Size': ['M', 'L', 'XL'],
+        'Gender': ['Men', 'Women', 'Unisex'],
+        'timestamp': ['2025-05-14T17:17:52.126699'] * 3
+    })
+
+
+def test_fingerprint_is_stable_and_ignores_timestamp(catalog):
+    later = catalog.assign(timestamp='2025-06-01T00:00:00.000000')
+    assert fingerprint_products(catalog).tolist() == fingerprint_products(later).tolist()
+    assert fingerprint_products(catalog).nunique() == 3
+
+
+def test_fingerprint_supports_list_columns(catalog):
+    listed = catalog.assign(Size=[['M'], ['L', 'XL'], []])
+    assert len(fingerprint_products(listed)) == 3
+
+
+def test_fingerprint_missing_columns():
+    with pytest.raises(ValueError) as exc_info:
+        fingerprint_products(pd.DataFrame({'Title': ['Hoodie 1']}))
+    assert "missing columns" in str(exc_info.value)
+
+
+def test_first_run_everything_is_new(catalog):
+    delta = classify_products(catalog, {})
+    assert delta['new']['Title'].tolist() == ['Hoodie 1', 'Pants 2', 'Jacket 3']
+    assert delta['changed'].empty
+    assert delta['unchanged'].empty
+    assert delta['disappeared'] == []
+
+
+def test_classify_new_changed_unchanged_disappeared(catalog):
+    state = classify_products(catalog, {})['state']
+
+    next_run = catalog[catalog['Title'] != 'Jacket 3'].copy()
+    next_run.loc[next_run['Title'] == 'Pants 2', 'Price'] = 3000000.0
+    next_run = pd.concat([next_run, pd.DataFrame([{
+        'Title': 'Crewneck 4', 'Price': 900000.0, 'Rating': 4.9, 'Colors': 2,
+        'Size': 'S', 'Gender': 'Men', 'timestamp': '2025-05-15T00:00:00.000000'
+    }])], ignore_index=True)
+
+    delta = classify_products(next_run, state)
+
+    assert delta['new']['Title'].tolist() == ['Crewneck 4']
+    assert delta['changed']['Title'].tolist() == ['Pants 2']
+    assert delta['unchanged']['Title'].tolist() == ['Hoodie 1']
+    assert delta['disappeared'] == ['Jacket 3']
+    assert set(delta['state']) == {'Hoodie 1', 'Pants 2', 'Crewneck 4'}
+
+
+def test_save_and_load_delta_state(tmp_path, catalog):
+    path = str(tmp_path / 'state' / 'delta.json')
+    assert load_delta_state(path) == {}
+
+    state = classify_products(catalog, {})['state']
+    save_delta_state(state, path)
+    assert load_delta_state(path) == state
+
+
+def test_load_delta_state_corrupt_file(tmp_path):
+    path = tmp_path / 'delta.json'
+    path.write_text('{not json')
+    with pytest.raises(ValueError) as exc_info:
+        load_delta_state(str(path))
+    assert "Error reading delta state" in str(exc_info.value)
@@ -1,13 +1,51 @@
 import pytest
 import requests
+import time
 from bs4 import BeautifulSoup
 from unittest.mock import Mock, patch
-from utils.extract import fetch_webpage, parse_product_info, scrape_product
+from benchmarks.synthetic_site import SyntheticSite, product_title, render_catalog_page
+from utils.extract import (
+    build_page_url,
+    close_session,
+    fetch_stats,
+    fetch_webpage,
+    find_last_page,
+    get_session,
+    iter_product_pages,
+    load_validators,
+    parse_page,
+    parse_page_rows,
+    parse_product_info,
+    reset_fetch_stats,
+    rows_to_products,
+    save_validators,
+    scrape_product
+)
+from utils.page_cache import PageCache
+
+
+def render_fake_page(page, total_pages, **options):
+    # Small, clean pages so tests can count every product
+    return render_catalog_page(page, total_pages, cards_per_page=3, dirty_every=0, **options)
+
+
+@pytest.fixture
+def fake_site(request):
+    # Local stand-in for Fashion Studio serving synthetic catalog pages
+    with SyntheticSite(7, cards_per_page=3, dirty_every=0,
+                       **getattr(request, "param", {})) as site:
+        yield site
+
+
+def without_timestamps(products):
+    return [{k: v for k, v in p.items() if k != 'timestamp'} for p in products]
+
 
 # Test fetch_webpage function
 def test_fetch_webpage_success():
-    with patch('requests.Session') as mock_session:
+    with patch('utils.extract.get_session') as mock_session:
         mock_response = Mock()
+        mock_response.status_code = 200
         mock_response.content = b"<html>Test content</html>"
         mock_session.return_value.get.return_value = mock_response
 
@@ -16,7 +54,7 @@ def test_fetch_webpage_success():
 
 
 def test_fetch_webpage_failure():
-    with patch('requests.Session') as mock_session:
+    with patch('utils.extract.get_session') as mock_session:
         mock_session.return_value.get.side_effect = requests.exceptions.RequestException
 
         with pytest.raises(ValueError) as exc_info:
@@ -25,7 +63,7 @@ def test_fetch_webpage_failure():
 
 
 def test_fetch_webpage_max_attempts():
-    with patch('requests.Session') as mock_session:
+    with patch('utils.extract.get_session') as mock_session:
         mock_session.return_value.get.side_effect = requests.exceptions.RequestException
 
         with pytest.raises(ValueError) as exc_info:
@@ -33,6 +71,55 @@ def test_fetch_webpage_max_attempts():
         assert "Failed to fetch" in str(exc_info.value)
         assert mock_session.return_value.get.call_count == 2
 
+def test_fetch_webpage_sends_conditional_headers():
+    validators = {"https://test-url.com": {"etag": '"abc"', "last_modified": "Wed, 14 May 2025 10:00:00 GMT"}}
+    with patch('utils.extract.get_session') as mock_session:
+        mock_session.return_value.get.return_value = Mock(status_code=304)
+
+        result = fetch_webpage("https://test-url.com", validators=validators)
+
+        assert result is None
+        headers = mock_session.return_value.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Wed, 14 May 2025 10:00:00 GMT"
+
+
+def test_fetch_webpage_stores_validators():
+    validators = {}
+    with patch('utils.extract.get_session') as mock_session:
+        mock_session.return_value.get.return_value = Mock(
+            status_code=200, content=b"<html></html>",
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 14 May 2025 10:00:00 GMT"})
+
+        fetch_webpage("https://test-url.com", validators=validators)
+
+    assert validators["https://test-url.com"]["etag"] == '"v1"'
+    assert validators["https://test-url.com"]["last_modified"] == "Wed, 14 May 2025 10:00:00 GMT"
+
+
+def test_get_session_is_shared_and_pooled():
+    close_session()
+    try:
+        session = get_session(pool_size=4)
+        assert get_session() is session
+        assert session.get_adapter("https://example.com")._pool_maxsize == 4
+        assert "gzip" in session.headers["Accept-Encoding"]
+
+        # A crawl with more workers than the pool holds gets a bigger pool
+        bigger = get_session(pool_size=8)
+        assert bigger is not session
+        assert bigger.get_adapter("https://example.com")._pool_maxsize == 8
+    finally:
+        close_session()
+
+
+def test_save_and_load_validators(tmp_path):
+    path = str(tmp_path / "state" / "validators.json")
+    assert load_validators(path) == {}
+
+    save_validators({"https://test-url.com": {"etag": '"v1"'}}, path)
+    assert load_validators(path) == {"https://test-url.com": {"etag": '"v1"'}}
+
 # Test parse_product_info function
 def test_parse_product_info_complete():
     html = """
@@ -79,6 +166,67 @@ def test_parse_product_info_missing_fields():
     assert 'timestamp' in result
 
 
+def test_parse_product_info_site_markup():
+    html = """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">T-shirt 2</h3>
+            <div class="price-container"><span class="price">$102.15</span></div>
+            <p style="font-size: 14px;">Rating: ⭐ 3.9 / 5</p>
+            <p style="font-size: 14px;">3 Colors</p>
+            <p style="font-size: 14px;">Size: M</p>
+            <p style="font-size: 14px;">Gender: Women</p>
+        </div>
+    </div>
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    result = parse_product_info(soup.find('div', class_='collection-card'))
+
+    assert result['Title'] == 'T-shirt 2'
+    assert result['Price'] == '$102.15'
+    assert result['Rating'] == 'Rating: ⭐ 3.9 / 5'
+    assert result['Colors'] == '3 Colors'
+    assert result['Size'] == 'Size: M'
+    assert result['Gender'] == 'Gender: Women'
+
+
+def test_parse_product_info_first_match_wins():
+    html = """
+    <div class="collection-card">
+        <p><b>Rating:</b> 1 / 5</p>
+        <p>Rating: 2 / 5</p>
+        <p>Rating: 3 / 5</p>
+        <p class="price">$5.00</p>
+        <span class="price">$6.00</span>
+        <h3>Not a title</h3>
+        <h3 class="product-title">Title</h3>
+    </div>
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    result = parse_product_info(soup.find('div', class_='collection-card'))
+
+    # A <p> with mixed children has no single string, so it is not a match
+    assert result['Rating'] == 'Rating: 2 / 5'
+    assert result['Price'] == '$5.00'
+    assert result['Title'] == 'Title'
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+def test_parse_page_backends_agree(parser):
+    _, products, is_last_page = parse_page(render_fake_page(2, 2), parser)
+    _, reference, _ = parse_page(render_fake_page(2, 2), "html.parser")
+
+    assert without_timestamps(products) == without_timestamps(reference)
+    assert len(products) == 3
+    assert is_last_page
+
+
+def test_parse_page_unknown_backend():
+    with pytest.raises(ValueError) as exc_info:
+        parse_page(b"<html></html>", "no-such-parser")
+    assert "is not installed" in str(exc_info.value)
+
+
 def test_parse_product_info_invalid_card():
     with pytest.raises(ValueError) as exc_info:
         parse_product_info(None)
@@ -143,3 +291,220 @@ def test_scrape_product_keyboard_interrupt():
         with pytest.raises(ValueError) as exc_info:
             scrape_product(max_pages=1)
         assert "Scraping was interrupted by user" in str(exc_info.value)
+
+
+def test_build_page_url():
+    assert build_page_url(1) == "https://fashion-studio.dicoding.dev/"
+    assert build_page_url(3) == "https://fashion-studio.dicoding.dev/page3"
+    assert build_page_url(2, "http://localhost:8000/") == "http://localhost:8000/page2"
+
+
+def test_find_last_page():
+    soup = BeautifulSoup(render_fake_page(1, 5), 'html.parser')
+    assert find_last_page(soup) == 5
+
+
+def test_find_last_page_without_pagination():
+    soup = BeautifulSoup("<div class='collection-card'></div>", 'html.parser')
+    assert find_last_page(soup) is None
+
+
+def test_scrape_product_concurrent_matches_sequential(fake_site):
+    sequential = scrape_product(delay=0, base_url=fake_site.url)
+    concurrent = scrape_product(concurrency=4, base_url=fake_site.url)
+
+    assert len(concurrent) == fake_site.total_pages * 3
+    assert without_timestamps(concurrent) == without_timestamps(sequential)
+    assert concurrent[0]['Title'] == product_title(0)
+    assert concurrent[-1]['Title'] == product_title(20)
+
+
+def test_scrape_product_concurrent_respects_max_pages(fake_site):
+    results = scrape_product(max_pages=3, concurrency=2, base_url=fake_site.url)
+    assert [p['Title'] for p in results][-1] == product_title(8)
+    assert len(results) == 9
+    assert "/page4" not in fake_site.requested
+
+
+def test_scrape_product_concurrent_single_page():
+    with patch('utils.extract.fetch_webpage') as mock_fetch:
+        mock_fetch.return_value = b"""
+        <div class="collection-card"><h3 class="product-title">Only</h3></div>
+        <li class="page-item next disabled"></li>
+        """
+        results = scrape_product(concurrency=4)
+        assert [p['Title'] for p in results] == ['Only']
+        assert mock_fetch.call_count == 1
+
+
+def test_scrape_product_concurrent_fetch_error():
+    with patch('utils.extract.fetch_webpage') as mock_fetch:
+        mock_fetch.side_effect = [render_fake_page(1, 3), ValueError("boom"), render_fake_page(3, 3)]
+
+        with pytest.raises(ValueError) as exc_info:
+            scrape_product(concurrency=2)
+        assert "Error during scraping" in str(exc_info.value)
+
+
+def test_scrape_product_reuses_connections(fake_site):
+    close_session()
+    reset_fetch_stats()
+    try:
+        scrape_product(delay=0, base_url=fake_site.url)
+        stats = fetch_stats()
+    finally:
+        close_session()
+
+    assert stats["requests"] == fake_site.total_pages
+    assert stats["bytes"] > 0
+    assert stats["retries"] == 0
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == fake_site.total_pages - 1
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_product_skips_unchanged_pages(fake_site, concurrency):
+    validators = {}
+    first_run = scrape_product(delay=0, concurrency=concurrency,
+                               base_url=fake_site.url, validators=validators)
+    assert len(first_run) == fake_site.total_pages * 3
+
+    reset_fetch_stats()
+    second_run = scrape_product(delay=0, concurrency=concurrency,
+                                base_url=fake_site.url, validators=validators)
+
+    # Unchanged pages are replayed from the products remembered last run
+    assert without_timestamps(second_run) == without_timestamps(first_run)
+    stats = fetch_stats()
+    assert stats["not_modified"] == fake_site.total_pages
+    assert stats["bytes"] == 0
+    assert "/page8" not in fake_site.requested
+
+
+def test_concurrent_crawl_reuses_validators_from_sequential_crawl(fake_site):
+    validators = {}
+    sequential = scrape_product(delay=0, base_url=fake_site.url, validators=validators)
+
+    concurrent = scrape_product(delay=0, concurrency=3, base_url=fake_site.url,
+                                validators=validators)
+
+    assert without_timestamps(concurrent) == without_timestamps(sequential)
+
+
+def test_scrape_product_refetches_unchanged_page_without_products(fake_site):
+    # Validators saved before products were remembered carry only the ETag
+    validators = {}
+    first_run = scrape_product(delay=0, base_url=fake_site.url, validators=validators)
+    for entry in validators.values():
+        entry.pop("products")
+
+    second_run = scrape_product(delay=0, base_url=fake_site.url, validators=validators)
+
+    assert without_timestamps(second_run) == without_timestamps(first_run)
+
+
+def test_scrape_product_serves_expired_cache_on_304(fake_site, tmp_path):
+    cache = PageCache(str(tmp_path / "pages"), ttl=3600)
+    validators = {}
+    first_run = scrape_product(delay=0, base_url=fake_site.url, validators=validators,
+                               cache=cache)
+
+    # Two hours later every cached page has expired
+    reset_fetch_stats()
+    with patch('utils.page_cache.time.time', side_effect=lambda now=time.time: now() + 7200):
+        second_run = scrape_product(delay=0, base_url=fake_site.url, validators=validators,
+                                    cache=cache)
+
+    assert without_timestamps(second_run) == without_timestamps(first_run)
+    assert fetch_stats()["not_modified"] == fake_site.total_pages
+    # Confirmed pages got a fresh TTL, so eviction after the crawl kept them
+    assert cache.get(fake_site.url) is not None
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_product_offline_replay(fake_site, tmp_path, concurrency):
+    cache = PageCache(str(tmp_path / "pages"))
+    online = scrape_product(delay=0, concurrency=concurrency,
+                            base_url=fake_site.url, cache=cache)
+    requests_made = len(fake_site.requested)
+
+    reset_fetch_stats()
+    replayed = scrape_product(delay=0, concurrency=concurrency,
+                              base_url=fake_site.url, cache=cache, offline=True)
+
+    assert len(fake_site.requested) == requests_made
+    assert without_timestamps(replayed) == without_timestamps(online)
+    assert fetch_stats()["cache_hits"] == fake_site.total_pages
+
+
+def test_scrape_product_offline_replay_missing_page(tmp_path):
+    cache = PageCache(str(tmp_path / "pages"))
+    with pytest.raises(ValueError) as exc_info:
+        scrape_product(cache=cache, offline=True)
+    assert "not in the page cache" in str(exc_info.value)
+
+
+def test_scrape_product_offline_requires_cache():
+    with pytest.raises(ValueError) as exc_info:
+        scrape_product(offline=True)
+    assert "Offline replay requires a page cache" in str(exc_info.value)
+
+
+def test_parse_page_rows_round_trip():
+    rows = parse_page_rows(render_fake_page(1, 1))
+    products = rows_to_products(rows)
+
+    assert all(isinstance(row, tuple) for row in rows)
+    assert without_timestamps(products) == without_timestamps(parse_page(render_fake_page(1, 1))[1])
+    assert list(products[0].keys()) == ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_product_parse_workers_match_sequential(fake_site, concurrency):
+    sequential = scrape_product(delay=0, base_url=fake_site.url)
+    pooled = scrape_product(concurrency=concurrency, parse_workers=2,
+                            base_url=fake_site.url)
+
+    assert without_timestamps(pooled) == without_timestamps(sequential)
+
+
+def test_scrape_product_invalid_parse_workers():
+    with pytest.raises(ValueError) as exc_info:
+        scrape_product(parse_workers=-1)
+    assert "Parse workers must be at least 1" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_iter_product_pages_yields_before_crawl_finishes(fake_site, concurrency):
+    pages = iter_product_pages(delay=0, concurrency=concurrency, base_url=fake_site.url)
+
+    first_page = next(pages)
+    assert [p['Title'] for p in first_page] == [product_title(i) for i in range(3)]
+    assert len(fake_site.requested) < fake_site.total_pages
+
+    remaining = [product for page in pages for product in page]
+    assert len(remaining) == (fake_site.total_pages - 1) * 3
+
+
+@pytest.mark.parametrize("fake_site", [{"pagination_window": 2, "link_last_page": False}],
+                         indirect=True)
+@pytest.mark.parametrize("parse_workers", [None, 1])
+def test_concurrent_crawl_follows_windowed_pagination(fake_site, parse_workers):
+    # Page 1 only links pages 1-3, yet the catalog has seven
+    products = scrape_product(delay=0, concurrency=3, parse_workers=parse_workers,
+                              base_url=fake_site.url)
+
+    assert len(products) == fake_site.total_pages * 3
+    assert products[-1]['Title'] == product_title(fake_site.total_pages * 3 - 1)
+
+
+def test_concurrent_crawl_only_fetches_a_window_ahead(fake_site):
+    pages = iter_product_pages(delay=0, concurrency=2, base_url=fake_site.url)
+    next(pages)
+    next(pages)
+    # Give idle workers time to run ahead if anything lets them
+    time.sleep(0.3)
+
+    # The first page, the page handed over and at most two fetches in flight
+    assert len(fake_site.requested) <= 4
+    pages.close()
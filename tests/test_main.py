@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+import pytest
+
+import main
+from main import check_stages, parse_args, parse_stages
+from tests import write_raw_snapshot
+from utils import sinks
+from utils.price_history import PriceHistory
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # main writes its snapshots and state relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_parse_stages():
+    assert parse_stages("load") == ["load"]
+    assert parse_stages("transform-load") == ["transform", "load"]
+    assert parse_stages("extract-load") == list(main.STAGES)
+    with pytest.raises(ValueError, match="backwards"):
+        parse_stages("load-extract")
+    with pytest.raises(ValueError, match="Unknown stage"):
+        parse_stages("publish")
+
+
+def test_check_stages_requires_a_contiguous_range():
+    assert check_stages(["load", "transform"]) == ["transform", "load"]
+    with pytest.raises(ValueError, match="contiguous"):
+        check_stages(["extract", "load"])
+
+
+def test_parse_args_overrides_settings():
+    args = parse_args(["--stages", "transform-load", "--rate-conversion", "15000",
+                       "--table", "products_test", "--sinks", "csv, parquet"])
+
+    assert args.stages == ["transform", "load"]
+    assert args.rate_conversion == 15000.0
+    assert args.table == "products_test"
+    assert args.sinks == ["csv", "parquet"]
+    assert args.db_url == main.DB_CONNECTION
+
+
+def test_transform_and_load_from_latest_raw_snapshot(workdir):
+    write_raw_snapshot(main.RAW_SNAPSHOT_DIR, "fashion_data_20250513_080000.csv", "$1.00")
+    write_raw_snapshot(main.RAW_SNAPSHOT_DIR, "fashion_data_20250514_171848.csv.gz", "$2.00")
+
+    assert main.cli(["--stages", "transform-load", "--sinks", "csv",
+                     "--rate-conversion", "10000", "--no-metrics"]) == 0
+
+    [loaded] = os.listdir(workdir / "products.csv")
+    products = pd.read_csv(workdir / "products.csv" / loaded)
+    assert products["Title"].tolist() == ["T-shirt 1"]
+    assert products["Price"].tolist() == [20000.0]
+    assert len(os.listdir(workdir / main.TRANSFORMED_SNAPSHOT_DIR)) == 1
+
+
+def test_load_from_named_transformed_snapshot(workdir):
+    os.makedirs(main.TRANSFORMED_SNAPSHOT_DIR)
+    pd.DataFrame({'Title': ['T-shirt 1'], 'Price': [16000.0], 'timestamp': ['2025-05-14T17:18:48']}) \
+        .to_csv(os.path.join(main.TRANSFORMED_SNAPSHOT_DIR, "fashion_data_20250514_171848.csv"),
+                index=False)
+
+    main.main(stages=["load"], sinks=["parquet"], metrics=False,
+              transformed_snapshot="fashion_data_20250514_171848.csv")
+
+    assert os.listdir(workdir / "products.parquet") == ["scrape_date=2025-05-14"]
+    with pytest.raises(ValueError, match="not found"):
+        main.main(stages=["load"], sinks=["csv"], metrics=False,
+                  transformed_snapshot="fashion_data_20240101_000000.csv")
+
+
+def scrape(day, prices):
+    return pd.DataFrame({'Title': list(prices), 'Price': list(prices.values()),
+                         'Rating': 4.5, 'Colors': 3, 'Size': 'M', 'Gender': 'Men',
+                         'timestamp': f"2025-05-{day:02d}T17:18:48.000000"})
+
+
+def test_delta_load_records_every_price(workdir, monkeypatch):
+    changes = []
+    monkeypatch.setitem(sinks._sinks, 'memory', lambda df: changes.append(df['Title'].tolist()))
+    monkeypatch.setattr(main, 'DELTA_SINKS', {'memory': 'memory'})
+    selected = ['memory', 'price_history']
+
+    main.load_deltas(scrape(1, {'Hoodie 3': 100000.0, 'T-shirt 1': 50000.0}),
+                     main.sink_arguments(), sinks=selected)
+    main.load_deltas(scrape(2, {'Hoodie 3': 120000.0, 'T-shirt 1': 50000.0}),
+                     main.sink_arguments(), sinks=selected)
+    main.load_deltas(scrape(3, {'Hoodie 3': 120000.0, 'T-shirt 1': 40000.0}),
+                     main.sink_arguments(), sinks=selected)
+
+    assert changes == [['Hoodie 3', 'T-shirt 1'], ['Hoodie 3'], ['T-shirt 1']]
+    with PriceHistory(main.PRICE_HISTORY_DB) as history:
+        assert history.runs()['observations'].tolist() == [2, 2, 2]
+        # T-shirt 1 was unchanged in the second run, yet its drop still shows
+        assert history.biggest_changes()['title'].tolist() == ['T-shirt 1']
+
+
+def test_streaming_loads_only_selected_sinks(workdir, monkeypatch):
+    pages = [[{'Title': f'T-shirt {n}', 'Price': '$1.00', 'Rating': 'Rating: ⭐ 4.5 / 5',
+               'Colors': '3 Colors', 'Size': 'Size: M', 'Gender': 'Gender: Men',
+               'timestamp': '2025-05-14T17:18:48.000000'}] for n in range(3)]
+    monkeypatch.setattr(main, 'iter_product_pages', lambda **options: iter(pages))
+    monkeypatch.setitem(sinks._sinks, 'postgresql', lambda df, *args: pytest.fail("not selected"))
+
+    items, rows = main.run_streaming({}, 2, 10000.0, main.sink_arguments(),
+                                     ['csv', 'price_history'])
+
+    assert (items, rows) == (3, 3)
+    [loaded] = os.listdir(workdir / "products.csv")
+    assert len(pd.read_csv(workdir / "products.csv" / loaded)) == 3
+    # Both chunks land in the same price history run
+    with PriceHistory(main.PRICE_HISTORY_DB) as history:
+        assert history.runs()['observations'].tolist() == [3]
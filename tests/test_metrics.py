@@ -0,0 +1,62 @@
+import json
+import time
+
+import pytest
+
+from utils.metrics import RunMetrics
+
+
+def test_stage_records_time_and_values():
+    metrics = RunMetrics()
+    with metrics.stage('extract'):
+        time.sleep(0.01)
+    metrics.record('extract', rows_out=20, bytes_fetched=4096)
+
+    stage = metrics.report()['stages']['extract']
+    assert stage['seconds'] >= 0.01
+    assert stage['success'] is True
+    assert stage['rows_out'] == 20
+    assert stage['peak_rss_bytes'] > 0
+
+
+def test_stage_marks_failures():
+    metrics = RunMetrics()
+    with pytest.raises(ValueError):
+        with metrics.stage('load'):
+            raise ValueError("Error saving to PostgreSQL")
+
+    report = metrics.report()
+    assert report['stages']['load']['success'] is False
+    assert report['success'] is False
+
+
+def test_disabled_metrics_record_nothing(tmp_path):
+    metrics = RunMetrics(enabled=False)
+    with metrics.stage('extract'):
+        pass
+    metrics.record('extract', rows_out=20)
+    metrics.write_json(str(tmp_path / 'report.json'))
+    metrics.write_prometheus(str(tmp_path / 'etl.prom'))
+
+    assert metrics.stages == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_json_and_prometheus(tmp_path):
+    metrics = RunMetrics()
+    with metrics.stage('transform'):
+        pass
+    metrics.record('transform', rows_in=1000, rows_out=867,
+                   rows_dropped={'invalid_title': 100, 'duplicates': 33})
+
+    metrics.write_json(str(tmp_path / 'state' / 'report.json'))
+    with open(tmp_path / 'state' / 'report.json') as f:
+        assert json.load(f)['stages']['transform']['rows_out'] == 867
+
+    metrics.write_prometheus(str(tmp_path / 'etl.prom'))
+    lines = (tmp_path / 'etl.prom').read_text().splitlines()
+    assert '# TYPE fashion_etl_stage_rows_out gauge' in lines
+    assert 'fashion_etl_stage_rows_out{stage="transform"} 867' in lines
+    assert 'fashion_etl_stage_rows_dropped{stage="transform",reason="invalid_title"} 100' in lines
+    assert 'fashion_etl_stage_success{stage="transform"} 1' in lines
+    assert 'fashion_etl_last_run_success 1' in lines
@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.orchestrator import run_sinks
+
+
+@pytest.fixture
+def processed_frame():
+    return pd.DataFrame({'Title': ['Product 1', 'Product 2'], 'Price': [1600000.0, 2400000.0]})
+
+
+def sleeping_sink(seconds, result=None):
+    def sink(df):
+        time.sleep(seconds)
+        return result
+    return sink
+
+
+def test_run_sinks_overlaps_sinks(processed_frame):
+    start = time.perf_counter()
+    results = run_sinks(processed_frame, {
+        'csv': sleeping_sink(0.2, 'written'),
+        'postgresql': sleeping_sink(0.2),
+        'google_sheets': sleeping_sink(0.2)
+    })
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert list(results) == ['csv', 'postgresql', 'google_sheets']
+    assert all(outcome['status'] == 'ok' for outcome in results.values())
+    assert results['csv']['result'] == 'written'
+
+
+def test_run_sinks_isolates_frame_changes(processed_frame):
+    seen = []
+
+    def mutating_sink(df):
+        df['colors'] = 'Red'
+
+    def reading_sink(df):
+        time.sleep(0.05)
+        seen.append(list(df.columns))
+
+    run_sinks(processed_frame, {'sqlite': mutating_sink, 'csv': reading_sink})
+
+    assert seen == [['Title', 'Price']]
+    assert list(processed_frame.columns) == ['Title', 'Price']
+
+
+def test_run_sinks_reports_failures_and_timeouts(processed_frame):
+    release = threading.Event()
+
+    def failing_sink(df):
+        raise ValueError("Error saving to PostgreSQL: connection refused")
+
+    def stuck_sink(df):
+        release.wait(5)
+
+    results = run_sinks(processed_frame, {
+        'csv': sleeping_sink(0),
+        'postgresql': failing_sink,
+        'google_sheets': stuck_sink
+    }, timeouts={'google_sheets': 0.1}, continue_on_error=True)
+    release.set()
+
+    assert results['csv']['status'] == 'ok'
+    assert results['postgresql']['status'] == 'failed'
+    assert 'connection refused' in results['postgresql']['error']
+    assert results['google_sheets']['status'] == 'timeout'
+
+
+def test_timed_out_sink_does_not_hold_the_process_open():
+    # Interpreter exit used to join the abandoned worker, so the run lasted as long as the sink
+    script = ("import time, pandas as pd\n"
+              "from utils.orchestrator import run_sinks\n"
+              "run_sinks(pd.DataFrame({'Title': ['T-shirt 1']}), {'slow': lambda df: time.sleep(5)},\n"
+              "          timeouts={'slow': 0.2}, continue_on_error=True)\n")
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert time.monotonic() - start < 4
+
+
+def test_run_sinks_reports_each_result(processed_frame):
+    reported = []
+    run_sinks(processed_frame, {'csv': sleeping_sink(0), 'parquet': sleeping_sink(0.05)},
+              on_result=lambda name, outcome: reported.append((name, outcome['status'])))
+
+    assert reported == [('csv', 'ok'), ('parquet', 'ok')]
+
+
+def test_run_sinks_stops_on_first_failure(processed_frame):
+    def failing_sink(df):
+        raise ValueError("Error saving to PostgreSQL: connection refused")
+
+    with pytest.raises(ValueError) as exc_info:
+        run_sinks(processed_frame, {'postgresql': failing_sink, 'csv': sleeping_sink(0.5)})
+    assert "Load failed for sink(s) postgresql" in str(exc_info.value)
+
+
+def test_run_sinks_rejects_unknown_timeouts(processed_frame):
+    with pytest.raises(ValueError):
+        run_sinks(processed_frame, {'csv': sleeping_sink(0)}, timeouts={'parquet': 1})
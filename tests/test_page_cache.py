@@ -0,0 +1,76 @@
+import os
+import pytest
+from unittest.mock import patch
+from utils.page_cache import PageCache
+
+
+def test_put_and_get(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put("https://test-url.com/page2", b"<html>page 2</html>")
+
+    assert cache.get("https://test-url.com/page2") == b"<html>page 2</html>"
+    assert cache.get("https://test-url.com/page3") is None
+
+
+def test_identical_pages_share_one_object(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put("https://test-url.com/", b"<html>same</html>")
+    cache.put("https://test-url.com/page1", b"<html>same</html>")
+
+    objects = [name for _, _, files in os.walk(cache.objects_dir) for name in files]
+    assert len(objects) == 1
+    assert cache.size() == len(b"<html>same</html>")
+
+
+def test_expired_pages_are_only_served_when_stale_allowed(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=60)
+    with patch('utils.page_cache.time.time', return_value=1000.0):
+        cache.put("https://test-url.com/", b"old")
+
+    with patch('utils.page_cache.time.time', return_value=1100.0):
+        assert cache.get("https://test-url.com/") is None
+        assert cache.get("https://test-url.com/", allow_stale=True) == b"old"
+
+
+def test_evict_expired_pages(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=60)
+    with patch('utils.page_cache.time.time', return_value=1000.0):
+        cache.put("https://test-url.com/", b"old")
+    with patch('utils.page_cache.time.time', return_value=1050.0):
+        cache.put("https://test-url.com/page2", b"new")
+
+    with patch('utils.page_cache.time.time', return_value=1070.0):
+        assert cache.evict() == 1
+        assert cache.get("https://test-url.com/", allow_stale=True) is None
+        assert cache.get("https://test-url.com/page2") == b"new"
+    assert cache.size() == 3
+
+
+def test_evict_oldest_pages_over_size_limit(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=10)
+    for i, url in enumerate(["https://test-url.com/", "https://test-url.com/page2", "https://test-url.com/page3"]):
+        with patch('utils.page_cache.time.time', return_value=1000.0 + i):
+            cache.put(url, f"page-{i}".encode())
+
+    assert cache.evict() == 2
+    assert cache.get("https://test-url.com/page3") == b"page-2"
+    assert cache.get("https://test-url.com/") is None
+    assert cache.size() <= 10
+
+
+def test_invalid_limits(tmp_path):
+    with pytest.raises(ValueError):
+        PageCache(str(tmp_path), ttl=0)
+    with pytest.raises(ValueError):
+        PageCache(str(tmp_path), max_bytes=-1)
+
+
+def test_touch_restarts_the_ttl(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=60)
+    with patch('utils.page_cache.time.time', return_value=1000.0):
+        cache.put("https://test-url.com/", b"old")
+
+    with patch('utils.page_cache.time.time', return_value=1100.0):
+        assert cache.touch("https://test-url.com/")
+        assert cache.get("https://test-url.com/") == b"old"
+        assert not cache.touch("https://test-url.com/missing")
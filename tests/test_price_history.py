@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from utils.price_history import PriceHistory, record_prices
+
+
+def scrape(day, prices):
+    return pd.DataFrame({
+        'Title': list(prices),
+        'Price': list(prices.values()),
+        'Rating': [4.5] * len(prices),
+        'timestamp': [f"2025-05-{day:02d}T17:18:{second:02d}.000001"
+                      for second in range(len(prices))]
+    })
+
+
+@pytest.fixture
+def history(tmp_path):
+    with PriceHistory(str(tmp_path / "price_history.db")) as store:
+        store.record_run(scrape(1, {'Hoodie 3': 100000.0, 'T-shirt 1': 50000.0, 'Pants 2': 80000.0}))
+        store.record_run(scrape(2, {'Hoodie 3': 120000.0, 'T-shirt 1': 50000.0, 'Pants 2': 40000.0}))
+        store.record_run(scrape(3, {'Hoodie 3': 90000.0, 'Jacket 9': 300000.0}))
+        yield store
+
+
+def test_price_series_for_one_product(history):
+    series = history.price_series('Hoodie 3')
+    assert series['price'].tolist() == [100000.0, 120000.0, 90000.0]
+    assert series['observed_at'].is_monotonic_increasing
+
+    month = history.price_series('Hoodie 3', start='2025-05-02', end='2025-05-02T23:59:59')
+    assert month['price'].tolist() == [120000.0]
+    assert history.price_series('Unknown').empty
+
+
+def test_biggest_changes_between_runs(history):
+    first, second, latest = history.runs()['run_id'].tolist()
+
+    changes = history.biggest_changes(first, second)
+    assert changes['title'].tolist() == ['Pants 2', 'Hoodie 3']
+    assert changes['change'].tolist() == [-40000.0, 20000.0]
+    assert changes['change_ratio'].tolist() == pytest.approx([-0.5, 0.2])
+
+    # Defaults to the two most recent runs; products missing from either are left out
+    assert history.biggest_changes()['title'].tolist() == ['Hoodie 3']
+
+
+def test_latest_price_per_product(history):
+    latest = history.latest_prices().set_index('title')['price']
+    assert latest.to_dict() == {'Hoodie 3': 90000.0, 'Jacket 9': 300000.0,
+                                'Pants 2': 40000.0, 'T-shirt 1': 50000.0}
+
+
+def test_recording_is_append_only_and_idempotent(tmp_path):
+    path = str(tmp_path / "price_history.db")
+    day_two = scrape(2, {'Hoodie 3': 120000.0})
+    assert record_prices(day_two, path) is not None
+    # Same scrape again, then an older backfilled snapshot
+    assert record_prices(day_two, path) is None
+    record_prices(scrape(1, {'Hoodie 3': 100000.0}), path)
+
+    with PriceHistory(path) as store:
+        assert store.price_series('Hoodie 3')['price'].tolist() == [100000.0, 120000.0]
+        # The backfilled scrape is older, so it does not replace the latest price
+        assert store.latest_prices()['price'].tolist() == [120000.0]
+        assert len(store.runs()) == 2
+
+
+def test_chunks_recorded_into_one_run(tmp_path):
+    with PriceHistory(str(tmp_path / "price_history.db")) as store:
+        run_id = store.record_run(scrape(1, {'Hoodie 3': 100000.0}))
+        assert store.record_run(scrape(2, {'T-shirt 1': 50000.0}), run_id=run_id) == run_id
+
+        assert store.runs()['observations'].tolist() == [2]
+        with pytest.raises(ValueError, match="Unknown price history run"):
+            store.record_run(scrape(3, {'Pants 2': 80000.0}), run_id=run_id + 1)
+
+
+def test_record_requires_title_and_price(tmp_path):
+    with PriceHistory(str(tmp_path / "price_history.db")) as store:
+        with pytest.raises(ValueError, match="missing columns: Price"):
+            store.record_run(pd.DataFrame({'Title': ['Hoodie 3']}))
+        with pytest.raises(ValueError, match="at least two"):
+            store.biggest_changes()
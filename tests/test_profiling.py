@@ -0,0 +1,60 @@
+import pstats
+import threading
+
+import pytest
+
+from utils.profiling import StageProfiler
+
+
+def busy_work():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_stage_writes_profile_and_allocations(tmp_path):
+    profiler = StageProfiler(str(tmp_path))
+    with profiler.stage('transform'):
+        kept = busy_work()
+
+    outputs = profiler.outputs['transform']
+    stats = pstats.Stats(outputs['profile'])
+    assert any(func[2] == 'busy_work' for func in stats.stats)
+
+    with open(outputs['allocations']) as f:
+        report = f.read()
+    assert report.startswith('Stage transform: peak traced memory')
+    assert 'test_profiling.py' in report
+    assert len(kept) == 20000
+
+
+def test_only_selected_stages_are_profiled(tmp_path):
+    profiler = StageProfiler(str(tmp_path), stages=['load'])
+    with profiler.stage('extract'):
+        busy_work()
+    profiler.wrap('load_postgresql', busy_work)()
+
+    assert list(profiler.outputs) == ['load_postgresql']
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'load_postgresql.prof', 'load_postgresql_allocations.txt']
+
+
+def test_wrapped_sinks_profile_their_own_threads(tmp_path):
+    profiler = StageProfiler(str(tmp_path), stages=['load'])
+    threads = [threading.Thread(target=profiler.wrap(f'load_{name}', busy_work))
+               for name in ('csv', 'parquet')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(profiler.outputs) == ['load_csv', 'load_parquet']
+
+
+def test_unwritable_output_is_reported(tmp_path):
+    blocker = tmp_path / 'profiles'
+    blocker.write_text('not a directory')
+    profiler = StageProfiler(str(blocker))
+
+    with pytest.raises(ValueError) as exc_info:
+        with profiler.stage('load'):
+            pass
+    assert 'Error writing profile for stage load' in str(exc_info.value)
@@ -0,0 +1,141 @@
+import time
+from email.utils import formatdate
+
+import pytest
+from unittest.mock import Mock, patch
+
+from utils.extract import close_session, fetch_stats, fetch_webpage, reset_fetch_stats, scrape_product
+from utils.ratelimit import AdaptiveRateLimiter, backoff_delay, parse_retry_after
+from benchmarks.synthetic_site import SyntheticSite, product_title
+from tests.test_extract import without_timestamps
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def flaky_site():
+    # Catalog that answers the first request for some pages with an error
+    failures = {"/page2": (429, "1"), "/page4": (503, None)}
+    with SyntheticSite(5, cards_per_page=3, dirty_every=0, failures=failures) as site:
+        yield site
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(formatdate(110, usegmt=True), now=100) == pytest.approx(10)
+    assert parse_retry_after(formatdate(90, usegmt=True), now=100) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delay_grows_and_is_capped():
+    with patch("utils.ratelimit.random.uniform", side_effect=lambda low, high: high):
+        assert [backoff_delay(attempt, base=1, cap=5) for attempt in range(4)] == [1, 2, 4, 5]
+
+
+def test_limiter_paces_after_burst():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    # Two tokens are available at once, the next two arrive half a second apart
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_limiter_adapts_to_latency():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=1.0, max_rate=5.0, target_latency=0.5)
+
+    limiter.record_success(0.1)
+    limiter.record_success(0.1)
+    limiter.record_success(0.1)
+    assert limiter.rate == 5.0
+
+    limiter.record_success(2.0)
+    assert limiter.rate == 2.5
+    limiter.record_success(2.0)
+    limiter.record_success(2.0)
+    assert limiter.rate == 1.0
+
+
+def test_limiter_burst_recovers_with_rate():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=1.0, max_rate=5.0, target_latency=0.5)
+
+    limiter.record_success(2.0)
+    limiter.record_success(2.0)
+    assert limiter.burst == 1.0
+    for _ in range(8):
+        limiter.record_success(0.1)
+    assert limiter.burst == 5.0
+
+    # An explicit burst stays as configured
+    fixed = AdaptiveRateLimiter(rate=4.0, burst=3, target_latency=0.5)
+    fixed.record_success(2.0)
+    fixed.record_success(0.1)
+    assert fixed.burst == 3
+
+
+def test_limiter_honours_retry_after():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=10.0, clock=clock, sleep=clock.sleep)
+
+    limiter.record_throttled(retry_after=3)
+    limiter.acquire()
+
+    assert limiter.rate == 5.0
+    assert clock.now >= 3
+
+
+def test_server_errors_slow_the_limiter_down():
+    limiter = AdaptiveRateLimiter(rate=8.0, min_rate=1.0)
+    session = Mock()
+    session.get.return_value = Mock(status_code=502, headers={})
+    session.get.return_value.raise_for_status.side_effect = Exception("502 Bad Gateway")
+
+    with patch("utils.extract.RETRY_BACKOFF_BASE", 0):
+        with pytest.raises(ValueError):
+            fetch_webpage("https://test-url.com/", session=session, limiter=limiter)
+
+    assert limiter.rate == 1.0
+
+
+def test_limiter_rejects_invalid_rates():
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(rate=10, max_rate=5)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_scrape_recovers_from_throttling(flaky_site, concurrency):
+    limiter = AdaptiveRateLimiter(rate=20.0)
+    reset_fetch_stats()
+    try:
+        with patch("utils.extract.RETRY_BACKOFF_BASE", 0.01):
+            start = time.monotonic()
+            products = scrape_product(base_url=flaky_site.url, concurrency=concurrency,
+                                      limiter=limiter)
+            elapsed = time.monotonic() - start
+    finally:
+        close_session()
+
+    expected = [product_title((page - 1) * 3) for page in range(1, flaky_site.total_pages + 1)]
+    assert [product["Title"] for product in without_timestamps(products)][::3] == expected
+    stats = fetch_stats()
+    assert stats["throttled"] == 2
+    assert stats["retries"] == 2
+    # The 429 asked for a one second pause before page 2 was tried again
+    assert elapsed >= 1
+    assert limiter.rate < 20.0
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import utils.sinks
+from utils.sinks import available_sinks, bind_sink, get_sink, register_sink
+from benchmarks.bench_import import HEAVY_MODULES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def restore_registry():
+    saved = dict(utils.sinks._sinks)
+    yield
+    utils.sinks._sinks.clear()
+    utils.sinks._sinks.update(saved)
+
+
+def test_builtin_sinks_are_registered():
+    assert {'csv', 'parquet', 'sqlite', 'postgresql', 'google_sheets'} <= set(available_sinks())
+
+
+def test_bind_sink_resolves_on_first_call(tmp_path):
+    sink = bind_sink('csv', str(tmp_path / "out"))
+    sink(pd.DataFrame({'Title': ['T-shirt 1'], 'Price': [160000.0]}))
+
+    assert len(os.listdir(tmp_path / "out")) == 1
+
+
+def test_register_sink_by_name(restore_registry):
+    received = []
+    register_sink('memory', lambda df, label: received.append((label, len(df))))
+    register_sink('csv_copy', 'utils.file_sinks:save_to_csv')
+
+    bind_sink('memory', 'run')(pd.DataFrame({'Title': ['a', 'b']}))
+
+    assert received == [('run', 2)]
+    assert get_sink('csv_copy') is get_sink('csv')
+
+
+def test_unknown_and_broken_sinks(restore_registry):
+    with pytest.raises(ValueError, match="Unknown sink 'ftp'"):
+        get_sink('ftp')
+    with pytest.raises(ValueError):
+        register_sink('bad', 'no_colon_here')
+
+    register_sink('missing', 'utils.no_such_module:save')
+    with pytest.raises(ValueError, match="Error loading sink 'missing'"):
+        get_sink('missing')
+
+
+def test_main_import_skips_database_and_google_clients():
+    # -X importtime lists every module the interpreter loaded at startup
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+
+    assert "utils.sinks" in imported
+    assert not imported & set(HEAVY_MODULES)
@@ -1,17 +1,34 @@
 import pytest
 import pandas as pd
 import numpy as np
+from hypothesis import given, settings, strategies as st
 from utils.transform import (
+    clean_price_series,
+    clean_rating_series,
+    count_dropped_rows,
     create_dataframe,
+    extract_colors_series,
+    extract_gender_series,
+    extract_sizes_series,
     process_dataframe,
     clean_price,
     clean_rating,
     extract_colors,
     extract_sizes,
     extract_gender,
+    iter_dataframe_chunks,
+    process_dataframe_chunks,
     transform_data
 )
 
+RAW_SNAPSHOT = 'raw_data.csv/fashion_data_20250514_171848.csv'
+TRANSFORMED_SNAPSHOT = 'transformed_data.csv/fashion_data_20250514_171848.csv'
+
+
+@pytest.fixture
+def raw_snapshot():
+    return pd.read_csv(RAW_SNAPSHOT)
+
 # Test create_dataframe function
 def test_create_dataframe_dict():
     data = {
@@ -100,6 +117,114 @@ def test_process_dataframe_with_missing_values():
     assert result['Price'].iloc[0] == 99.99 * 16000
 
 
+def test_process_dataframe_matches_bundled_snapshot(raw_snapshot):
+    expected = pd.read_csv(TRANSFORMED_SNAPSHOT)
+    result = process_dataframe(raw_snapshot, 16000)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_process_dataframe_leaves_input_untouched(raw_snapshot):
+    original = raw_snapshot.copy()
+    process_dataframe(raw_snapshot, 16000)
+    pd.testing.assert_frame_equal(raw_snapshot, original)
+
+
+def test_count_dropped_rows_adds_up(raw_snapshot):
+    dropped = count_dropped_rows(raw_snapshot)
+    kept = len(process_dataframe(raw_snapshot, 16000))
+
+    assert sum(dropped.values()) == len(raw_snapshot) - kept
+    assert dropped["invalid_title"] > 0
+    assert set(dropped) == {"missing_values", "duplicates", "invalid_title",
+                            "invalid_rating", "invalid_price"}
+
+
+def test_process_dataframe_copy_false_reuses_clean_frame():
+    data = pd.DataFrame({
+        'Title': ['Product 1', 'Product 2'],
+        'Price': ['$1,099.99', '$5.00'],
+        'Rating': ['Rating: ⭐ 4.5 / 5', 'Rating: ⭐ 3.0 / 5'],
+        'Colors': ['3 Colors', '5 Colors'],
+        'Size': ['Size: M', 'Size: L'],
+        'Gender': ['Gender: Men', 'Gender: Women']
+    })
+
+    result = process_dataframe(data, 16000, copy=False)
+
+    assert result is data
+    assert result['Price'].tolist() == [round(1099.99 * 16000, 2), 80000.0]
+    assert result['Colors'].tolist() == [3, 5]
+    assert result['Gender'].tolist() == ['Men', 'Women']
+
+
+def test_process_dataframe_mixed_value_types():
+    # Non-string cells take the pandas string accessor path and become NaN
+    data = pd.DataFrame({
+        'Title': ['Product 1', 'Product 2'],
+        'Price': ['$10.00', '$20.00'],
+        'Rating': ['Rating: 4.5 / 5', 4.0],
+        'Colors': ['3 Colors', '2 Colors'],
+        'Size': ['Size: M', 'Size: L'],
+        'Gender': ['Gender: Men', 'Gender: Women']
+    })
+
+    result = process_dataframe(data, 1)
+    assert result['Rating'].iloc[0] == 4.5
+    assert np.isnan(result['Rating'].iloc[1])
+
+
+def test_process_dataframe_invalid_colors():
+    data = pd.DataFrame({
+        'Title': ['Product 1'], 'Price': ['$10.00'], 'Rating': ['4.5 / 5'],
+        'Colors': ['Many Colors'], 'Size': ['Size: M'], 'Gender': ['Gender: Men']
+    })
+
+    with pytest.raises(ValueError) as exc_info:
+        process_dataframe(data, 1)
+    assert "Failed to process Colors column" in str(exc_info.value)
+
+
+# Test chunked processing
+def test_iter_dataframe_chunks():
+    pages = [[{'Title': f'P{page}-{i}'} for i in range(3)] for page in range(4)]
+    chunks = list(iter_dataframe_chunks(iter(pages), 5))
+
+    assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+    assert chunks[1]['Title'].iloc[0] == 'P1-2'
+
+
+def test_iter_dataframe_chunks_invalid_size():
+    with pytest.raises(ValueError) as exc_info:
+        list(iter_dataframe_chunks([], 0))
+    assert "Chunk size must be a positive integer" in str(exc_info.value)
+
+
+def test_process_dataframe_chunks_matches_full_run(raw_snapshot):
+    # Repeat a slice so duplicates straddle chunk boundaries
+    raw = pd.concat([raw_snapshot, raw_snapshot.iloc[100:250]], ignore_index=True)
+    chunks = (raw.iloc[start:start + 128] for start in range(0, len(raw), 128))
+
+    streamed = pd.concat(process_dataframe_chunks(chunks, 16000), ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, process_dataframe(raw, 16000))
+
+
+def test_process_dataframe_chunks_is_lazy():
+    consumed = []
+
+    def chunks():
+        for i in range(3):
+            consumed.append(i)
+            yield pd.DataFrame({
+                'Title': [f'Product {i}'], 'Price': ['$1.00'], 'Rating': ['4.0 / 5'],
+                'Colors': ['3 Colors'], 'Size': ['Size: M'], 'Gender': ['Gender: Men']
+            })
+
+    stream = process_dataframe_chunks(chunks(), 16000)
+    first = next(stream)
+    assert consumed == [0]
+    assert first['Title'].iloc[0] == 'Product 0'
+
+
 # Test clean_price function
 def test_clean_price_valid():
     assert clean_price('$99.99') == 99.99
@@ -168,6 +293,72 @@ def test_extract_gender_invalid():
     assert extract_gender('No gender here') == 'No gender here' 
 
 
+# Property-based equivalence of the vectorized kernels with the helpers
+def field_text(prefixes):
+    fragments = st.sampled_from(prefixes + [' ', ',', ', ', '.', '$', '⭐', '/ 5', '\t', '٣', '\xa0'])
+    words = st.text(alphabet='abcXYZ0123456789.,$ ', max_size=8)
+    return st.lists(st.one_of(fragments, words), max_size=6).map(''.join)
+
+
+def column_values(prefixes):
+    return st.lists(st.one_of(
+        field_text(prefixes),
+        st.none(),
+        st.just(''),
+        st.just(float('nan')),
+        st.integers(min_value=-5, max_value=5),
+        st.floats(allow_nan=False, allow_infinity=False, width=16)
+    ), max_size=20)
+
+
+def assert_kernel_matches(values, kernel, reference):
+    series = pd.Series(values, dtype=object, name='column')
+    pd.testing.assert_series_equal(kernel(series), series.apply(reference))
+
+
+@settings(max_examples=200, deadline=None)
+@given(column_values(['Price: ', '$', '1,234', '99.99']))
+def test_clean_price_series_matches_reference(values):
+    assert_kernel_matches(values, clean_price_series, clean_price)
+
+
+@settings(max_examples=200, deadline=None)
+@given(column_values(['Rating: ', '4.5', ' / 5', 'Invalid Rating']))
+def test_clean_rating_series_matches_reference(values):
+    assert_kernel_matches(values, clean_rating_series, clean_rating)
+
+
+@settings(max_examples=200, deadline=None)
+@given(column_values(['Colors:', 'Colors: ', 'Red', 'Blue']))
+def test_extract_colors_series_matches_reference(values):
+    assert_kernel_matches(values, extract_colors_series, extract_colors)
+
+
+@settings(max_examples=200, deadline=None)
+@given(column_values(['Size:', 'Size: ', 'M', 'XL']))
+def test_extract_sizes_series_matches_reference(values):
+    assert_kernel_matches(values, extract_sizes_series, extract_sizes)
+
+
+@settings(max_examples=200, deadline=None)
+@given(column_values(['Gender:', 'Gender: ', 'Men', 'Unisex']))
+def test_extract_gender_series_matches_reference(values):
+    assert_kernel_matches(values, extract_gender_series, extract_gender)
+
+
+def test_list_kernels_return_independent_lists():
+    sizes = extract_sizes_series(pd.Series(['Size: M', 'Size: M']))
+    sizes.iloc[0].append('L')
+    assert sizes.iloc[1] == ['M']
+
+
+def test_kernels_on_non_text_column():
+    missing = pd.Series([np.nan, np.nan])
+    assert clean_price_series(missing).tolist() == [None, None]
+    assert extract_colors_series(missing).tolist() == [[], []]
+    assert extract_gender_series(missing).tolist() == [None, None]
+
+
 # Test transform_data function
 def test_transform_data_valid():
     data = [
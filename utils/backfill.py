@@ -0,0 +1,140 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from utils.file_sinks import CsvChunkWriter, CSV_COMPRESSION_SUFFIXES, list_snapshots, read_snapshot
+from utils.orchestrator import run_sinks
+from utils.transform import process_dataframe
+
+
+def load_backfill_state(path):
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Error reading backfill state from {path}: {str(e)}")
+
+
+def save_backfill_state(state, path):
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file first so a crash never leaves a truncated record
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    except OSError as e:
+        raise ValueError(f"Error writing backfill state to {path}: {str(e)}")
+
+
+def output_name(snapshot):
+    # The transformed file keeps the raw snapshot's timestamp, so each raw
+    # snapshot maps to exactly one output and reruns replace it
+    name = os.path.basename(snapshot)
+    for suffix in CSV_COMPRESSION_SUFFIXES.values():
+        if suffix and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _source_stamp(snapshot):
+    stat = os.stat(snapshot)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def transform_snapshot(snapshot, output_dir, rate_conversion, return_frame=False):
+    # Process-pool entry point: each worker reads, transforms and writes one snapshot
+    start = time.perf_counter()
+    raw = read_snapshot(snapshot, dtype=str)
+    processed = process_dataframe(raw, rate_conversion)
+
+    with CsvChunkWriter(os.path.join(output_dir, output_name(snapshot))) as writer:
+        writer.write(processed)
+
+    result = {"rows_in": len(raw), "rows_out": len(processed),
+              "seconds": time.perf_counter() - start}
+    return result, processed if return_frame else None
+
+
+def backfill(snapshot_dir, output_dir, rate_conversion, state_path, sinks=None,
+             workers=None, version=None, force=False):
+    snapshots = list_snapshots(snapshot_dir)
+    if not snapshots:
+        raise ValueError(f"No snapshots found in {snapshot_dir}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"Backfill workers must be at least 1, got {workers}")
+
+    # A snapshot is done once it was processed with the same version label and
+    # has not changed since; bump the version after changing the transform
+    state = load_backfill_state(state_path)
+    pending = []
+    for snapshot in snapshots:
+        entry = state.get(os.path.basename(snapshot))
+        done = (entry is not None and entry.get("version") == version
+                and entry.get("source") == _source_stamp(snapshot))
+        if force or not done:
+            pending.append(snapshot)
+
+    skipped = len(snapshots) - len(pending)
+    print(f"Backfilling {len(pending)} of {len(snapshots)} snapshots "
+          f"({skipped} already done) from {snapshot_dir}")
+
+    summary = {"snapshots": len(snapshots), "processed": 0, "skipped": skipped,
+               "rows_out": 0, "seconds": 0.0}
+    if not pending:
+        return summary
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        raise ValueError(f"Error creating backfill output directory {output_dir}: {str(e)}")
+
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    # Spawned workers, like the parse pool in extract, so no thread state is forked
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(transform_snapshot, snapshot, output_dir, rate_conversion,
+                                   bool(sinks)): snapshot
+                   for snapshot in pending}
+
+        try:
+            for future in as_completed(futures):
+                snapshot = futures[future]
+                name = os.path.basename(snapshot)
+                try:
+                    result, processed = future.result()
+                except Exception as e:
+                    raise ValueError(f"Backfill failed for snapshot {name}: {str(e)}")
+
+                # Database and API sinks stay in this process; workers only transform
+                if sinks:
+                    run_sinks(processed, sinks)
+
+                state[name] = {"version": version, "source": _source_stamp(snapshot),
+                               "rows_in": result["rows_in"], "rows_out": result["rows_out"],
+                               "finished_at": time.time()}
+                save_backfill_state(state, state_path)
+
+                summary["processed"] += 1
+                summary["rows_out"] += result["rows_out"]
+                print(f"[{summary['processed']}/{len(pending)}] {name}: {result['rows_in']} -> "
+                      f"{result['rows_out']} rows in {result['seconds']:.2f}s")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    summary["seconds"] = time.perf_counter() - start
+    print(f"Backfilled {summary['processed']} snapshots ({summary['rows_out']} rows) "
+          f"in {summary['seconds']:.2f}s with {workers} workers")
+    return summary
@@ -0,0 +1,102 @@
+import json
+import os
+import time
+
+
+class ScrapeCheckpoint:
+    def __init__(self, path, max_age=None):
+        if max_age is not None and max_age <= 0:
+            raise ValueError(f"Checkpoint age limit must be positive, got {max_age}")
+
+        self.path = path
+        self.max_age = max_age
+        self.pages = {}
+        self.resumed = False
+        self._file = None
+
+    def _read(self):
+        header = None
+        pages = {}
+        intact_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can cut the last line short; everything before it is intact
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                if header is None:
+                    header = entry
+                else:
+                    pages[entry["page"]] = entry
+                intact_bytes += len(line)
+        return header, pages, intact_bytes
+
+    def open(self, base_url, start_page):
+        header, pages, intact_bytes = None, {}, 0
+        if os.path.exists(self.path):
+            try:
+                header, pages, intact_bytes = self._read()
+            except (OSError, KeyError, TypeError) as e:
+                print(f"Ignoring unreadable scrape checkpoint {self.path}: {str(e)}")
+
+        # Only resume a crawl of the same site from the same page that is recent enough
+        usable = (
+            header is not None
+            and header.get("base_url") == base_url
+            and header.get("start_page") == start_page
+            and (self.max_age is None or time.time() - header.get("started_at", 0) <= self.max_age)
+        )
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            if usable:
+                self.pages = pages
+                self.resumed = bool(pages)
+                self._file = open(self.path, "a", encoding="utf-8")
+                # Drop a half-written last line before appending after it
+                self._file.truncate(intact_bytes)
+                if pages:
+                    print(f"Resuming scrape from checkpoint with {len(pages)} completed pages")
+            else:
+                self.pages = {}
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._append({"base_url": base_url, "start_page": start_page,
+                              "started_at": time.time()})
+        except OSError as e:
+            raise ValueError(f"Error opening scrape checkpoint {self.path}: {str(e)}")
+
+    def _append(self, entry):
+        # One line per page, flushed and synced so a crash loses at most the page in flight
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def get(self, page):
+        return self.pages.get(page)
+
+    def record(self, page, products, is_last_page=False, last_page=None):
+        entry = {"page": page, "is_last_page": is_last_page, "last_page": last_page,
+                 "products": products}
+        try:
+            self._append(entry)
+        except OSError as e:
+            raise ValueError(f"Error writing scrape checkpoint {self.path}: {str(e)}")
+        self.pages[page] = entry
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self):
+        # A finished crawl has nothing to resume, so the next run starts fresh
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.pages = {}
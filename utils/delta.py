@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+KEY_COLUMN = "Title"
+FINGERPRINT_COLUMNS = ["Price", "Rating", "Colors", "Size", "Gender"]
+
+
+def _hashable_column(series):
+    # transform_data leaves Colors/Size as lists, which cannot be hashed
+    if series.dtype == object:
+        return series.map(lambda value: ",".join(map(str, value))
+                          if isinstance(value, (list, tuple)) else value)
+    return series
+
+
+def fingerprint_products(df):
+    missing = [col for col in [KEY_COLUMN] + FINGERPRINT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Cannot fingerprint products, missing columns: {', '.join(missing)}")
+
+    # hash_pandas_object uses a fixed hash key, so fingerprints are stable
+    # across runs and processes
+    values = df[FINGERPRINT_COLUMNS].apply(_hashable_column)
+    hashes = pd.util.hash_pandas_object(values, index=False)
+    return hashes.map(lambda value: format(value, "016x"))
+
+
+def load_delta_state(path):
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Error reading delta state from {path}: {str(e)}")
+
+
+def save_delta_state(state, path):
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file first so a crash never leaves a truncated index
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    except OSError as e:
+        raise ValueError(f"Error writing delta state to {path}: {str(e)}")
+
+
+def classify_products(df, state):
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("Input data must be a pandas DataFrame")
+
+    # One row per product; a later row for the same key wins
+    current = df.drop_duplicates(subset=KEY_COLUMN, keep="last")
+    fingerprints = fingerprint_products(current)
+    keys = current[KEY_COLUMN]
+
+    previous = keys.map(state)
+    is_new = previous.isna()
+    is_changed = ~is_new & (previous != fingerprints)
+
+    new_state = dict(zip(keys, fingerprints))
+    disappeared = sorted(set(state) - set(new_state))
+
+    return {
+        "new": current[is_new.to_numpy()],
+        "changed": current[is_changed.to_numpy()],
+        "unchanged": current[(~is_new & ~is_changed).to_numpy()],
+        "disappeared": disappeared,
+        "state": new_state
+    }
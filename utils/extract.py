@@ -1,89 +1,460 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+import json
+import multiprocessing
+import os
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+
+from utils.ratelimit import THROTTLE_STATUSES, backoff_delay, parse_retry_after
+
+BASE_URL = "https://fashion-studio.dicoding.dev/"
 
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
 }
 
+PAGE_LINK_PATTERN = re.compile(r"/page(\d+)/?$")
+
+DEFAULT_POOL_SIZE = 10
+
+# Upper bound of the first retry wait; it doubles on every further attempt
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 30.0
+
+# "lxml" is considerably faster; "html.parser" needs no C extension
+DEFAULT_HTML_PARSER = "html.parser"
+
+# Only product cards and pagination are ever read, so skip building the rest.
+# The class attribute is matched as one string while parsing, hence the regex
+PAGE_STRAINER = SoupStrainer(
+    class_=re.compile(r"(?:^|\s)(?:collection-card|pagination|page-item)(?:\s|$)"))
+
+PRODUCT_FIELDS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender')
+PRODUCT_COLUMNS = PRODUCT_FIELDS + ('timestamp',)
+
+# Text markers identifying the plain <p> lines of a card; "Colors" follows
+# the count ("3 Colors"), so markers are matched anywhere in the text
+CARD_TEXT_MARKERS = (
+    ('Rating:', 'Rating'),
+    ('Colors', 'Colors'),
+    ('Size:', 'Size'),
+    ('Gender:', 'Gender')
+)
+
+# One keep-alive session shared by every fetch (and every fetch worker)
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+_fetch_stats = {"requests": 0, "not_modified": 0, "cache_hits": 0, "bytes": 0, "retries": 0,
+                "throttled": 0}
+_connection_baseline = (0, 0)
+_stats_lock = threading.Lock()
+
+
+def build_page_url(page, base_url=BASE_URL):
+    if page == 1:
+        return base_url
+    return f"{base_url.rstrip('/')}/page{page}"
+
+
+def get_session(pool_size=None):
+    global _session, _session_pool_size
+
+    with _session_lock:
+        if _session is not None and pool_size is None:
+            return _session
+        pool_size = pool_size or DEFAULT_POOL_SIZE
+
+        # Rebuild only when a crawl needs more connections than the pool holds
+        if _session is None or _session_pool_size < pool_size:
+            if _session is not None:
+                _session.close()
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(REQUEST_HEADERS)
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+
+            _session = session
+            _session_pool_size = pool_size
+
+        return _session
+
+
+def close_session():
+    global _session, _session_pool_size
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pool_size = 0
+
+
+def _connection_counts(session):
+    # urllib3 pools count every request and every new connection they open;
+    # the difference is the number of requests served over a kept-alive socket
+    requests_made = 0
+    connections_opened = 0
+
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            requests_made += pool.num_requests
+            connections_opened += pool.num_connections
+
+    return requests_made, connections_opened
+
+
+def reset_fetch_stats():
+    global _connection_baseline
 
-def fetch_webpage(url, max_attempts=3):
-    session = requests.Session()
+    with _stats_lock:
+        for key in _fetch_stats:
+            _fetch_stats[key] = 0
+        _connection_baseline = _connection_counts(_session) if _session else (0, 0)
+
+
+def fetch_stats():
+    with _stats_lock:
+        stats = dict(_fetch_stats)
+        baseline = _connection_baseline
+
+    requests_made, connections_opened = (
+        _connection_counts(_session) if _session else (0, 0))
+    requests_made = max(requests_made - baseline[0], 0)
+    connections_opened = max(connections_opened - baseline[1], 0)
+
+    stats["new_connections"] = connections_opened
+    stats["reused_connections"] = max(requests_made - connections_opened, 0)
+    return stats
+
+
+def _count(stat, amount=1):
+    with _stats_lock:
+        _fetch_stats[stat] += amount
+
+
+def load_validators(path):
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Error reading HTTP validators from {path}: {str(e)}")
+
+
+def save_validators(validators, path):
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(validators, f, indent=2, sort_keys=True)
+    except OSError as e:
+        raise ValueError(f"Error writing HTTP validators to {path}: {str(e)}")
+
+
+def fetch_webpage(url, max_attempts=3, validators=None, session=None,
+                  cache=None, offline=False, limiter=None):
+    if cache is not None:
+        # Offline replay accepts anything cached, however old
+        content = cache.get(url, allow_stale=offline)
+        if content is not None:
+            _count("cache_hits")
+            return content
+    if offline:
+        raise ValueError(f"{url} is not in the page cache and offline replay is enabled")
+
+    session = session or get_session()
+
+    # Conditional GET: replay the validators seen on the previous fetch so an
+    # unchanged page comes back as an empty 304
+    headers = {}
+    cached = validators.get(url, {}) if validators is not None else {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
 
     for attempt in range(max_attempts):
+        retry_after = None
         try:
-            response = session.get(url, headers=REQUEST_HEADERS, timeout=10)
+            # The limiter is shared by every fetch worker, so it paces the crawl as a whole
+            if limiter is not None:
+                limiter.acquire()
+            _count("requests")
+            started = time.monotonic()
+            response = session.get(url, headers=headers, timeout=10)
+            if response.status_code in THROTTLE_STATUSES:
+                _count("throttled")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if limiter is not None:
+                    limiter.record_throttled(retry_after)
+            elif limiter is not None:
+                if response.status_code >= 500:
+                    # Fast 5xx answers still mean the server is struggling
+                    limiter.record_throttled()
+                elif response.status_code < 400:
+                    limiter.record_success(time.monotonic() - started)
+            if response.status_code == 304:
+                _count("not_modified")
+                if cache is not None:
+                    # An expired copy the server just confirmed is still current
+                    content = cache.get(url, allow_stale=True)
+                    if content is not None:
+                        cache.touch(url)
+                        return content
+                return None
             response.raise_for_status()
+            _count("bytes", len(response.content))
+
+            if validators is not None:
+                entry = validators.setdefault(url, {})
+                entry["etag"] = response.headers.get("ETag")
+                entry["last_modified"] = response.headers.get("Last-Modified")
+            if cache is not None:
+                cache.put(url, response.content)
+
             return response.content
         except Exception as e:
             print(f"Failed to fetch {url} (attempt {attempt+1}/{max_attempts}): {e}")
             if attempt < max_attempts - 1:
-                time.sleep(2)
+                _count("retries")
+                # Never retry sooner than the server asked us to
+                time.sleep(max(retry_after or 0,
+                               backoff_delay(attempt, RETRY_BACKOFF_BASE, RETRY_BACKOFF_CAP)))
 
     raise ValueError(f"Failed to fetch {url} after {max_attempts} attempts")
 
 
 def parse_product_info(card):
     try:
-        title = card.find('h3', class_='product-title')
-        price_element = card.find(['span', 'p'], class_='price')
-        rating_element = card.find(
-            'p', string=lambda text: text and 'Rating:' in text)
-        colors_element = card.find(
-            'p', string=lambda text: text and 'Colors' in text)
-        size_element = card.find(
-            'p', string=lambda text: text and 'Size:' in text)
-        gender_element = card.find(
-            'p', string=lambda text: text and 'Gender:' in text)
+        # Walk the card once and keep the first element that matches each
+        # field, mirroring what a separate card.find() per field would return
+        found = {}
+        for node in card.descendants:
+            name = node.name
+            if name is None:
+                continue
+
+            if name == 'h3':
+                if 'Title' not in found and 'product-title' in node.get('class', ()):
+                    found['Title'] = node
+            elif name == 'span' or name == 'p':
+                if 'Price' not in found and 'price' in node.get('class', ()):
+                    found['Price'] = node
+                if name == 'p':
+                    text = node.string
+                    if text:
+                        for marker, field in CARD_TEXT_MARKERS:
+                            if field not in found and marker in text:
+                                found[field] = node
+
+            if len(found) == len(PRODUCT_FIELDS):
+                break
 
         product_info = {
-            'Title': title.text.strip() if title else None,
-            'Price': price_element.text.strip() if price_element else None,
-            'Rating': rating_element.text.strip() if rating_element else None,
-            'Colors': colors_element.text.strip() if colors_element else None,
-            'Size': size_element.text.strip() if size_element else None,
-            'Gender': gender_element.text.strip() if gender_element else None,
-            'timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
+            field: found[field].text.strip() if field in found else None
+            for field in PRODUCT_FIELDS
         }
+        product_info['timestamp'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
 
         return product_info
     except Exception as e:
         raise ValueError(f"Error extracting product data: {str(e)}")
 
 
-def scrape_product(start_page=1, delay=1, max_pages=None):
+def find_last_page(soup):
+    # Highest page number in the link labels or their hrefs. A windowed
+    # pagination ("1 2 3 ... Next") only shows pages near the current one, so
+    # this is a lower bound on the last page, not the last page itself
+    page_numbers = []
+    for link in soup.select('.pagination a, .pagination .page-link'):
+        label = link.get_text(strip=True)
+        if label.isdigit():
+            page_numbers.append(int(label))
+
+        match = PAGE_LINK_PATTERN.search(link.get('href', '') or '')
+        if match:
+            page_numbers.append(int(match.group(1)))
+
+    return max(page_numbers) if page_numbers else None
+
+
+def parse_page(content, parser=DEFAULT_HTML_PARSER):
+    try:
+        soup = BeautifulSoup(content, parser, parse_only=PAGE_STRAINER)
+    except FeatureNotFound:
+        raise ValueError(f"HTML parser '{parser}' is not installed")
+    products = []
+
+    for card in soup.find_all('div', class_='collection-card'):
+        product = parse_product_info(card)
+        if product:
+            products.append(product)
+
+    is_last_page = soup.find('li', class_='page-item next disabled') is not None
+    return soup, products, is_last_page
+
+
+def parse_page_rows(content, parser=DEFAULT_HTML_PARSER):
+    # Process-pool entry point: ship back plain tuples instead of the soup
+    # and per-row dicts so results stay cheap to pickle
+    return parse_page_state(content, parser)[0]
+
+
+def parse_page_state(content, parser=DEFAULT_HTML_PARSER):
+    # Rows plus the pagination facts the concurrent crawl needs to know where to stop
+    soup, products, is_last_page = parse_page(content, parser)
+    rows = [tuple(product[column] for column in PRODUCT_COLUMNS) for product in products]
+    return rows, is_last_page, find_last_page(soup)
+
+
+def rows_to_products(rows):
+    return [dict(zip(PRODUCT_COLUMNS, row)) for row in rows]
+
+
+def _remember_page(validators, url, **page_state):
+    # Keep pagination facts and parsed products next to the validators so a
+    # later 304 for the same URL still yields the page and where the catalog ends
+    if validators is not None:
+        validators.setdefault(url, {}).update(page_state)
+
+
+def _replay_unchanged(validators, url):
+    # A 304 means the page still lists what was parsed from it last time; the
+    # products are re-stamped because they were seen again on this run
+    entry = validators.get(url, {}) if validators is not None else {}
+    if entry.get("products") is None:
+        return None
+    timestamp = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')
+    products = [dict(product, timestamp=timestamp) for product in entry["products"]]
+    return products, entry.get("is_last_page", False)
+
+
+def scrape_product(start_page=1, delay=1, max_pages=None, concurrency=1,
+                   base_url=BASE_URL, validators=None, cache=None,
+                   offline=False, parser=DEFAULT_HTML_PARSER,
+                   parse_workers=None, checkpoint=None, limiter=None):
     product_list = []
+    for products in iter_product_pages(
+            start_page=start_page, delay=delay, max_pages=max_pages,
+            concurrency=concurrency, base_url=base_url,
+            validators=validators, cache=cache, offline=offline,
+            parser=parser, parse_workers=parse_workers, checkpoint=checkpoint,
+            limiter=limiter):
+        product_list.extend(products)
+    return product_list
+
+
+def iter_product_pages(start_page=1, delay=1, max_pages=None, concurrency=1,
+                       base_url=BASE_URL, validators=None, cache=None,
+                       offline=False, parser=DEFAULT_HTML_PARSER,
+                       parse_workers=None, checkpoint=None, limiter=None):
+    if offline and cache is None:
+        raise ValueError("Offline replay requires a page cache")
+
+    # Pages completed by an earlier, failed run are replayed from the
+    # checkpoint instead of being fetched again
+    if checkpoint is not None:
+        checkpoint.open(base_url, start_page)
+
+    # Parsing in worker processes needs the page range up front, which only
+    # the concurrent path knows
+    if (concurrency and concurrency > 1) or parse_workers:
+        pages = _iter_pages_concurrent(
+            start_page=start_page, max_pages=max_pages,
+            concurrency=concurrency or 1, base_url=base_url,
+            validators=validators, cache=cache, offline=offline,
+            parser=parser, parse_workers=parse_workers, checkpoint=checkpoint,
+            limiter=limiter)
+    else:
+        pages = _iter_pages_sequential(
+            start_page=start_page, delay=delay, max_pages=max_pages,
+            base_url=base_url, validators=validators, cache=cache,
+            offline=offline, parser=parser, checkpoint=checkpoint,
+            limiter=limiter)
+
+    try:
+        yield from pages
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    if checkpoint is not None:
+        checkpoint.complete()
+    _evict_cache(cache, offline)
+
+
+def _evict_cache(cache, offline):
+    # Replay must never shrink the corpus it is reading from
+    if cache is not None and not offline:
+        removed = cache.evict()
+        if removed:
+            print(f"Evicted {removed} pages from the page cache")
+
+
+def _iter_pages_sequential(start_page, delay, max_pages, base_url, validators,
+                           cache, offline, parser, checkpoint=None, limiter=None):
     current_page = start_page
     pages_processed = 0
+    products_scraped = 0
+    fetch = partial(fetch_webpage, validators=validators, cache=cache,
+                    offline=offline, limiter=limiter)
 
     try:
         while True:
             if max_pages and pages_processed >= max_pages:
                 break
 
-            url = "https://fashion-studio.dicoding.dev/" if current_page == 1 else f"https://fashion-studio.dicoding.dev/page{current_page}"
-            print(f"Processing page {current_page}: {url}")
+            url = build_page_url(current_page, base_url)
+            saved = checkpoint.get(current_page) if checkpoint is not None else None
 
-            content = fetch_webpage(url)
-            if not content:
-                current_page += 1
-                pages_processed += 1
-                continue
+            if saved is not None:
+                print(f"Reusing page {current_page} from checkpoint")
+                products, is_last_page = saved["products"], saved["is_last_page"]
+            else:
+                print(f"Processing page {current_page}: {url}")
 
-            soup = BeautifulSoup(content, "html.parser")
-            cards = soup.find_all('div', class_='collection-card')
+                content = fetch(url)
+                replayed = _replay_unchanged(validators, url) if content is None else None
+                if replayed is not None:
+                    print(f"Page {current_page} unchanged since last run")
+                    products, is_last_page = replayed
+                else:
+                    if content is None:
+                        # Validators without remembered products: fetch the page in full
+                        content = fetch(url, validators=None)
+                    _, products, is_last_page = parse_page(content, parser)
+                    _remember_page(validators, url, is_last_page=is_last_page, products=products)
+                if checkpoint is not None:
+                    checkpoint.record(current_page, products, is_last_page=is_last_page)
 
-            for card in cards:
-                product = parse_product_info(card)
-                if product:
-                    product_list.append(product)
+            products_scraped += len(products)
+            yield products
 
-            next_button = soup.find('li', class_='page-item next disabled')
-            if not next_button:
+            if not is_last_page:
                 current_page += 1
                 pages_processed += 1
-                time.sleep(delay)
+                # A rate limiter replaces the fixed pause between pages
+                if not offline and saved is None and limiter is None:
+                    time.sleep(delay)
             else:
                 print("Reached final page")
                 break
@@ -94,5 +465,182 @@ def scrape_product(start_page=1, delay=1, max_pages=None):
     except Exception as e:
         raise ValueError(f"Error during scraping: {str(e)}")
 
-    print(f"Successfully scraped {len(product_list)} products from {pages_processed+1} pages")
-    return product_list
+    print(f"Successfully scraped {products_scraped} products from {pages_processed+1} pages")
+
+
+def _iter_pages_concurrent(start_page, max_pages, concurrency, base_url,
+                           validators, cache, offline, parser, parse_workers,
+                           checkpoint=None, limiter=None):
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    if parse_workers is not None and parse_workers < 1:
+        raise ValueError(f"Parse workers must be at least 1, got {parse_workers}")
+
+    fetch = partial(fetch_webpage, validators=validators, cache=cache,
+                    offline=offline, limiter=limiter)
+    products_scraped = 0
+
+    try:
+        # Size the shared pool so every worker keeps its own warm connection
+        if not offline:
+            get_session(pool_size=concurrency)
+
+        def fetch_or_replay(url):
+            # Page bytes to parse, or (products, is_last_page) for an unchanged page
+            content = fetch(url)
+            if content is None:
+                replayed = _replay_unchanged(validators, url)
+                if replayed is not None:
+                    return replayed
+                # Validators without remembered products: fetch the page in full
+                content = fetch(url, validators=None)
+            return content
+
+        # The first page tells us how many pages there are
+        first_url = build_page_url(start_page, base_url)
+        saved = checkpoint.get(start_page) if checkpoint is not None else None
+        if saved is not None and saved["last_page"] is None and not saved["is_last_page"]:
+            # Sequential runs do not record the page count, so fetch the page again
+            saved = None
+        content = None
+        if saved is None:
+            print(f"Processing page {start_page}: {first_url}")
+            content = fetch_or_replay(first_url)
+            if (isinstance(content, tuple) and not content[1]
+                    and not validators[first_url].get('last_page')):
+                # Sequential runs do not record the page count, so fetch the page again
+                content = fetch(first_url, validators=None)
+
+        if saved is not None:
+            print(f"Reusing page {start_page} from checkpoint")
+            last_page = saved["last_page"] or start_page
+            products_scraped += len(saved["products"])
+            yield saved["products"]
+        else:
+            if isinstance(content, tuple):
+                # 304 on the first page: fall back to the pagination seen last run
+                print(f"Page {start_page} unchanged since last run")
+                products, is_last_page = content
+                last_page = start_page if is_last_page else validators[first_url].get('last_page')
+            else:
+                soup, products, is_last_page = parse_page(content, parser)
+                last_page = start_page if is_last_page else find_last_page(soup)
+                _remember_page(validators, first_url, is_last_page=is_last_page,
+                               last_page=last_page, products=products)
+            if checkpoint is not None:
+                checkpoint.record(start_page, products, is_last_page=is_last_page,
+                                  last_page=last_page)
+            products_scraped += len(products)
+            yield products
+
+        if last_page is None:
+            raise ValueError(
+                f"Could not determine the last page from {first_url}")
+        # Pages past max_pages are never fetched, however far the catalog goes
+        limit = start_page + max_pages - 1 if max_pages else None
+        next_page = start_page + 1
+        print(f"Fetching pages from {next_page} with {concurrency} workers")
+
+        def see_page(page, is_last_page, last_seen=None):
+            # Pagination may only show a window of pages around the current one,
+            # so every page handed over can push the end of the crawl further out.
+            # Only a page whose Next link is disabled ends it
+            nonlocal last_page
+            if is_last_page:
+                last_page = page
+            else:
+                last_page = max(last_page, page + 1, last_seen or 0)
+
+        def fetch_page(page):
+            saved = checkpoint.get(page) if checkpoint is not None else None
+            return saved if saved is not None else fetch_or_replay(build_page_url(page, base_url))
+
+        def finish_page(page, future, from_rows):
+            products = future.result()
+            if from_rows:
+                rows, is_last_page, last_seen = products
+                products = rows_to_products(rows)
+                _remember_page(validators, build_page_url(page, base_url),
+                               is_last_page=is_last_page, products=products)
+                if checkpoint is not None:
+                    checkpoint.record(page, products, is_last_page=is_last_page)
+                see_page(page, is_last_page, last_seen)
+            return products
+
+        def replayed(products):
+            future = Future()
+            future.set_result(products)
+            return future
+
+        # Spawned (not forked) workers, since fetch threads are already running
+        parse_pool = None
+        if parse_workers and last_page > start_page:
+            parse_pool = ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context("spawn"))
+
+        try:
+            # At most `concurrency` fetches run ahead of the consumer, and they are
+            # taken in page order no matter which request finishes first
+            fetches = deque()
+            parsed_pages = deque()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                def fill_window():
+                    nonlocal next_page
+                    while (len(fetches) < concurrency and next_page <= last_page
+                           and (limit is None or next_page <= limit)):
+                        fetches.append((next_page, executor.submit(fetch_page, next_page)))
+                        next_page += 1
+
+                fill_window()
+                while fetches or parsed_pages:
+                    if fetches:
+                        page, future = fetches.popleft()
+                        content = future.result()
+                        if isinstance(content, dict):
+                            # Checkpointed pages queue up behind pages still being parsed
+                            print(f"Reusing page {page} from checkpoint")
+                            see_page(page, content["is_last_page"])
+                            parsed_pages.append((page, replayed(content["products"]), False))
+                        elif isinstance(content, tuple):
+                            print(f"Page {page} unchanged since last run")
+                            products, is_last_page = content
+                            if checkpoint is not None:
+                                checkpoint.record(page, products, is_last_page=is_last_page)
+                            see_page(page, is_last_page)
+                            parsed_pages.append((page, replayed(products), False))
+                        elif parse_pool:
+                            parsed_pages.append(
+                                (page, parse_pool.submit(parse_page_state, content, parser), True))
+                        else:
+                            soup, products, is_last_page = parse_page(content, parser)
+                            _remember_page(validators, build_page_url(page, base_url),
+                                           is_last_page=is_last_page, products=products)
+                            if checkpoint is not None:
+                                checkpoint.record(page, products, is_last_page=is_last_page)
+                            see_page(page, is_last_page, find_last_page(soup))
+                            fill_window()
+                            products_scraped += len(products)
+                            yield products
+
+                    # Hand over every page whose parse has already finished. Wait for
+                    # the oldest one rather than queue more than `concurrency`, or
+                    # when only its pagination can tell whether more pages follow
+                    while parsed_pages and (parsed_pages[0][1].done() or not fetches
+                                            or len(parsed_pages) >= concurrency):
+                        products = finish_page(*parsed_pages.popleft())
+                        fill_window()
+                        products_scraped += len(products)
+                        yield products
+                    fill_window()
+        finally:
+            if parse_pool:
+                parse_pool.shutdown(cancel_futures=True)
+
+    except KeyboardInterrupt:
+        print("Scraping interrupted by user")
+        raise ValueError("Scraping was interrupted by user")
+    except Exception as e:
+        raise ValueError(f"Error during scraping: {str(e)}")
+
+    print(f"Successfully scraped {products_scraped} products from {next_page - start_page} pages")
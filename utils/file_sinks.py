@@ -0,0 +1,245 @@
+import pandas as pd
+from datetime import datetime
+import gzip
+import io
+import os
+import re
+import tempfile
+
+# Parquet types of the processed product columns; anything else is stored as string
+PARQUET_COLUMN_TYPES = {
+    'Title': 'string', 'Price': 'float64', 'Rating': 'float64', 'Colors': 'int64',
+    'Size': 'string', 'Gender': 'string', 'timestamp': 'timestamp[us]'
+}
+PARQUET_PARTITION_COLUMN = 'scrape_date'
+CSV_COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+# Names written by snapshot_path(); in-progress temp files never match
+SNAPSHOT_PATTERN = re.compile(r'^fashion_data_\d{8}_\d{6}\.csv(?:\.gz|\.zst)?$')
+
+
+def snapshot_path(output_dir, compression=None):
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'fashion_data_{timestamp}.csv' + CSV_COMPRESSION_SUFFIXES[compression]
+    return os.path.join(output_dir, filename)
+
+
+class CsvChunkWriter:
+    def __init__(self, filepath, compression=None):
+        if compression not in CSV_COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported CSV compression: {compression}")
+
+        self.filepath = filepath
+        self.compression = compression
+        self.rows = 0
+        self._header_written = False
+
+        try:
+            # Chunks go to a temp file next to the target that only replaces it
+            # on close, so readers never see a half-written snapshot
+            directory = os.path.dirname(filepath) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, self._tmp_path = tempfile.mkstemp(
+                dir=directory, prefix='.' + os.path.basename(filepath), suffix='.tmp')
+            self._raw = os.fdopen(fd, 'wb')
+            self._text = io.TextIOWrapper(self._open_stream(), encoding='utf-8', newline='')
+        except Exception as e:
+            self.abort()
+            raise ValueError(f"CSV file operation error: {str(e)}")
+
+    def _open_stream(self):
+        if self.compression == 'gzip':
+            return gzip.GzipFile(fileobj=self._raw, mode='wb')
+        if self.compression == 'zstd':
+            # zstandard is only needed for .zst output, so it is imported on first use
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("zstd compression requires zstandard, install it with 'pip install zstandard'")
+            return zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        return self._raw
+
+    def write(self, df):
+        if df.empty:
+            return
+
+        try:
+            df.to_csv(self._text, header=not self._header_written, index=False)
+            self._header_written = True
+            self.rows += len(df)
+        except Exception as e:
+            raise ValueError(f"CSV file operation error: {str(e)}")
+
+    def close(self):
+        if self.rows == 0:
+            # Nothing was written, not even a header, so leave no snapshot behind
+            self.abort()
+            return
+
+        try:
+            # Closing the compressor writes its trailer but leaves the file open,
+            # since it still has to be synced and renamed
+            stream = self._text.detach()
+            if stream is not self._raw:
+                stream.close()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+            # mkstemp creates files readable only by the owner
+            os.chmod(self._tmp_path, 0o644)
+            os.replace(self._tmp_path, self.filepath)
+        except Exception as e:
+            self.abort()
+            raise ValueError(f"CSV file operation error: {str(e)}")
+
+    def abort(self):
+        for stream in (getattr(self, '_text', None), getattr(self, '_raw', None)):
+            try:
+                if stream is not None:
+                    stream.close()
+            except Exception:
+                pass
+        tmp_path = getattr(self, '_tmp_path', None)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def list_snapshots(output_dir):
+    if not os.path.isdir(output_dir):
+        return []
+    # Snapshot names embed their timestamp, so name order is time order
+    return [os.path.join(output_dir, name) for name in sorted(os.listdir(output_dir))
+            if SNAPSHOT_PATTERN.match(name)]
+
+
+def resolve_snapshot(output_dir, name=None):
+    if name is None or name == 'latest':
+        snapshots = list_snapshots(output_dir)
+        if not snapshots:
+            raise ValueError(f"No snapshots found in {output_dir}")
+        return snapshots[-1]
+
+    # Either a path or a file name inside the snapshot directory
+    for candidate in (name, os.path.join(output_dir, name)):
+        if os.path.isfile(candidate):
+            return candidate
+    raise ValueError(f"Snapshot {name} not found in {output_dir}")
+
+
+def read_snapshot(path, dtype=None):
+    try:
+        # Compression is inferred from the .gz/.zst suffix
+        return pd.read_csv(path, dtype=dtype)
+    except Exception as e:
+        raise ValueError(f"Error reading snapshot {path}: {str(e)}")
+
+
+def save_to_csv(df, output_dir, compression=None):
+    if df.empty:
+        raise ValueError("No data to save to CSV")
+
+    try:
+        filepath = snapshot_path(output_dir, compression)
+    except OSError as e:
+        raise ValueError(f"CSV file operation error: {str(e)}")
+
+    with CsvChunkWriter(filepath, compression) as writer:
+        writer.write(df)
+    print(f"Successfully saved data to {filepath}")
+
+
+def _import_pyarrow():
+    # pyarrow is only needed by the Parquet sink, so it is imported on first use
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ValueError("Parquet output requires pyarrow, install it with 'pip install pyarrow'")
+    return pa, ds
+
+
+def _partitioning(pa, ds):
+    return ds.partitioning(pa.schema([(PARQUET_PARTITION_COLUMN, pa.string())]), flavor='hive')
+
+
+def _parquet_string(value):
+    if isinstance(value, (list, tuple)):
+        return ','.join(map(str, value))
+    if value is None or isinstance(value, str):
+        return value
+    return None if pd.isna(value) else str(value)
+
+
+def save_to_parquet(df, dataset_dir, column_types=PARQUET_COLUMN_TYPES, compression='zstd'):
+    if df.empty:
+        raise ValueError("No data to save to Parquet")
+
+    if 'timestamp' not in df.columns:
+        raise ValueError("Parquet output is partitioned by scrape date and needs a timestamp column")
+
+    pa, ds = _import_pyarrow()
+
+    try:
+        frame = df.copy(deep=False)
+        fields = []
+        for col in df.columns:
+            arrow_type = pa.type_for_alias(column_types.get(col, 'string'))
+            if pa.types.is_timestamp(arrow_type):
+                frame[col] = pd.to_datetime(frame[col], format='ISO8601')
+            elif pa.types.is_string(arrow_type):
+                frame[col] = frame[col].map(_parquet_string)
+            fields.append(pa.field(col, arrow_type))
+
+        scraped = pd.to_datetime(df['timestamp'], format='ISO8601')
+        frame[PARQUET_PARTITION_COLUMN] = scraped.dt.strftime('%Y-%m-%d')
+        fields.append(pa.field(PARQUET_PARTITION_COLUMN, pa.string()))
+
+        table = pa.Table.from_pandas(frame, schema=pa.schema(fields), preserve_index=False)
+
+        # Each run adds its own files to the date partitions instead of replacing them
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        ds.write_dataset(
+            table, dataset_dir, format='parquet',
+            partitioning=_partitioning(pa, ds),
+            basename_template=f'fashion_data_{run_id}_{{i}}.parquet',
+            file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        print(f"Successfully saved {len(df)} records to Parquet dataset {dataset_dir}")
+
+    except Exception as e:
+        raise ValueError(f"Parquet file operation error: {str(e)}")
+
+
+def read_parquet_dataset(dataset_dir, columns=None, start_date=None, end_date=None):
+    pa, ds = _import_pyarrow()
+
+    try:
+        dataset = ds.dataset(dataset_dir, format='parquet', partitioning=_partitioning(pa, ds))
+
+        # Date bounds prune whole partitions, columns prune the rest of each file
+        partition = ds.field(PARQUET_PARTITION_COLUMN)
+        condition = None
+        if start_date is not None:
+            condition = partition >= str(start_date)
+        if end_date is not None:
+            upper = partition <= str(end_date)
+            condition = upper if condition is None else condition & upper
+
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    except Exception as e:
+        raise ValueError(f"Parquet file operation error: {str(e)}")
@@ -1,33 +1,76 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+import numpy as np
 import pandas as pd
 import sqlite3
-from datetime import datetime
+import io
+import math
 import os
+import random
+import threading
+import time
+
+# The file sinks live in their own module so runs that only write files do not
+# import the database and Google API clients; they are re-exported here
+from utils.file_sinks import (
+    CSV_COMPRESSION_SUFFIXES,
+    PARQUET_COLUMN_TYPES,
+    PARQUET_PARTITION_COLUMN,
+    CsvChunkWriter,
+    list_snapshots,
+    read_parquet_dataset,
+    read_snapshot,
+    resolve_snapshot,
+    save_to_csv,
+    save_to_parquet,
+    snapshot_path
+)
+
+DEFAULT_DB_POOL_SIZE = 5
+DEFAULT_DB_MAX_OVERFLOW = 10
+SQLITE_BATCH_SIZE = 5000
+SHEETS_MAX_CELLS_PER_REQUEST = 10000
+SHEETS_MIN_REQUEST_INTERVAL = 1.0
+SHEETS_RETRY_DELAY = 1.0
+SHEETS_RETRY_STATUSES = {429, 500, 502, 503, 504}
+SQLITE_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp', 'transformed_at']
+
+_engines = {}
+_engine_stats = {}
+_engines_lock = threading.Lock()
+
+# Databases whose schema was already set up by this process
+_initialized_databases = set()
+
+
+def _create_products_schema(conn):
+    # Create products table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            price REAL,
+            rating REAL,
+            colors TEXT,
+            size TEXT,
+            gender TEXT,
+            timestamp DATETIME,
+            transformed_at DATETIME
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_products_title ON products (title)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_products_timestamp ON products (timestamp)")
 
 
 def create_database(db_path):
+    conn = None
     try:
         conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Create products table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                price REAL,
-                rating REAL,
-                colors TEXT,
-                size TEXT,
-                gender TEXT,
-                timestamp DATETIME,
-                transformed_at DATETIME
-            )
-        ''')
-
-        conn.commit()
+        with conn:
+            _create_products_schema(conn)
+        _initialized_databases.add(os.path.abspath(db_path))
         print(f"Database initialized at {db_path}")
 
     except sqlite3.Error as e:
@@ -37,62 +80,81 @@ def create_database(db_path):
             conn.close()
 
 
-def save_to_database(df, db_path):
-    if df.empty:
-        raise ValueError("No data to save to database")
+def _connect_sqlite(db_path):
+    path = os.path.abspath(db_path)
+    needs_schema = path not in _initialized_databases or not os.path.exists(path)
 
-    try:
-        # Ensure database exists
-        create_database(db_path)
+    # Autocommit mode, so every transaction below is opened explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    if needs_schema:
+        _create_products_schema(conn)
+        _initialized_databases.add(path)
+    return conn
 
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
 
-        # Convert lists to strings for storage
-        df['colors'] = df['Colors'].apply(lambda x: ','.join(x) if x else '')
-        df['size'] = df['Size'].apply(lambda x: ','.join(x) if x else '')
+def _join_values(value):
+    if isinstance(value, (list, tuple)):
+        return ','.join(value)
+    return value if value else ''
 
-        # Prepare data for insertion
-        records = df[['Title', 'Price', 'Rating', 'colors', 'size', 'Gender', 'timestamp', 'transformed_at']].values.tolist()
 
-        # Insert data
-        cursor.executemany('''
-            INSERT INTO products (title, price, rating, colors, size, gender, timestamp, transformed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', records)
+def save_to_database(df, db_path, batch_size=SQLITE_BATCH_SIZE):
+    if df.empty:
+        raise ValueError("No data to save to database")
 
-        conn.commit()
-        print(f"Successfully saved {len(records)} records to database")
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError(f"Batch size must be a positive integer, got {batch_size}")
 
-    except sqlite3.Error as e:
+    conn = None
+    try:
+        start = time.perf_counter()
+        conn = _connect_sqlite(db_path)
+
+        # Convert lists and datetimes to strings for storage without touching
+        # the caller's frame; sqlite3 cannot bind pandas Timestamps
+        columns = []
+        for col in SQLITE_COLUMNS:
+            if col == 'transformed_at' and col not in df.columns:
+                # Only transform_data() stamps rows; process_dataframe() output is stored with NULL
+                columns.append(pd.Series(None, index=df.index, dtype=object))
+                continue
+            values = df[col]
+            if col in ('Colors', 'Size'):
+                values = values.map(_join_values)
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.strftime('%Y-%m-%dT%H:%M:%S.%f').astype(object).where(values.notna(), None)
+            columns.append(values)
+        records = list(zip(*(col.tolist() for col in columns)))
+
+        for offset in range(0, len(records), batch_size):
+            conn.execute("BEGIN")
+            try:
+                conn.executemany('''
+                    INSERT INTO products (title, price, rating, colors, size, gender, timestamp, transformed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', records[offset:offset + batch_size])
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+        elapsed = time.perf_counter() - start
+        rows_per_sec = len(records) / elapsed if elapsed > 0 else float('inf')
+        print(f"Successfully saved {len(records)} records to database "
+              f"in {elapsed:.2f}s ({rows_per_sec:,.0f} rows/sec)")
+
+        return {'rows': len(records), 'seconds': elapsed, 'rows_per_sec': rows_per_sec}
+
+    except (sqlite3.Error, KeyError) as e:
         raise ValueError(f"Database operation error: {str(e)}")
     finally:
         if conn:
             conn.close()
 
 
-def save_to_csv(df, output_dir):
-    if df.empty:
-        raise ValueError("No data to save to CSV")
-
-    try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'fashion_data_{timestamp}.csv'
-        filepath = os.path.join(output_dir, filename)
-
-        # Save to CSV
-        df.to_csv(filepath, index=False)
-        print(f"Successfully saved data to {filepath}")
-
-    except Exception as e:
-        raise ValueError(f"CSV file operation error: {str(e)}")
-
-
 def load_data(df, db_path, output_dir):
     if df.empty:
         raise ValueError("No data to load")
@@ -136,14 +198,355 @@ def save_to_google_sheets(df, service_account_file, spreadsheet_id, scopes):
         raise ValueError(f"Error saving to Google Sheets: {str(e)}")
 
 
+def append_to_google_sheets(df, service_account_file, spreadsheet_id, scopes,
+                            replace=False):
+    try:
+        RANGE_NAME = 'Sheet1!A1'
+        credential = Credentials.from_service_account_file(
+            service_account_file, scopes=scopes)
+        service = build('sheets', 'v4', credentials=credential)
+        sheet = service.spreadsheets()
+
+        # The first chunk of a run starts a fresh table with its header
+        values = df.values.tolist()
+        if replace:
+            sheet.values().clear(
+                spreadsheetId=spreadsheet_id, range='Sheet1').execute()
+            values = [df.columns.tolist()] + values
+
+        # values().append writes below the last row of the existing table
+        result = sheet.values().append(
+            spreadsheetId=spreadsheet_id,
+            range=RANGE_NAME,
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': values}
+        ).execute()
+
+        return result
+
+    except Exception as e:
+        raise ValueError(f"Error appending to Google Sheets: {str(e)}")
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _sheet_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ','.join(map(str, value))
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _changed_row_blocks(current, desired, width):
+    # Rows past the end of the new table are blanked, so stale products disappear
+    blocks = []
+    for index in range(max(len(current), len(desired))):
+        old = current[index] if index < len(current) else []
+        new = desired[index] if index < len(desired) else []
+        old = old + [''] * (width - len(old))
+        new = new + [''] * (width - len(new))
+        if old == new:
+            continue
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == index:
+            blocks[-1][1].append(new)
+        else:
+            blocks.append((index, [new]))
+    return blocks
+
+
+def _batch_requests(blocks, sheet_name, width, max_cells):
+    rows_per_request = max(1, max_cells // max(width, 1))
+    last_column = _column_letter(width - 1)
+
+    data = []
+    cells = 0
+    for start, rows in blocks:
+        for offset in range(0, len(rows), rows_per_request):
+            part = rows[offset:offset + rows_per_request]
+            if data and cells + len(part) * width > max_cells:
+                yield data
+                data, cells = [], 0
+            first_row = start + offset + 1
+            data.append({
+                'range': f"{sheet_name}!A{first_row}:{last_column}{first_row + len(part) - 1}",
+                'values': part
+            })
+            cells += len(part) * width
+    if data:
+        yield data
+
+
+def _execute_with_retries(request, max_attempts, retry_delay):
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if e.resp.status not in SHEETS_RETRY_STATUSES or attempt == max_attempts:
+                raise
+            # Exponential backoff with jitter, as the Sheets quota docs recommend
+            delay = retry_delay * 2 ** (attempt - 1) * (1 + random.random())
+            print(f"Sheets API returned {e.resp.status}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt}/{max_attempts})")
+            time.sleep(delay)
+
+
+def _write_row_blocks(values_api, spreadsheet_id, blocks, sheet_name, width, max_cells,
+                      min_interval, max_attempts, retry_delay):
+    requests_sent = 0
+    updated_cells = 0
+    last_request = None
+    for data in _batch_requests(blocks, sheet_name, width, max_cells):
+        # Space writes out so a large sync stays under the per-minute quota
+        if last_request is not None:
+            wait = min_interval - (time.monotonic() - last_request)
+            if wait > 0:
+                time.sleep(wait)
+        last_request = time.monotonic()
+
+        _execute_with_retries(values_api.batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'valueInputOption': 'RAW', 'data': data}
+        ), max_attempts, retry_delay)
+        requests_sent += 1
+        updated_cells += sum(len(item['values']) * width for item in data)
+    return requests_sent, updated_cells
+
+
+def sync_to_google_sheets(df, service_account_file, spreadsheet_id, scopes, sheet_name='Sheet1',
+                          max_cells=SHEETS_MAX_CELLS_PER_REQUEST,
+                          min_interval=SHEETS_MIN_REQUEST_INTERVAL, max_attempts=5,
+                          retry_delay=SHEETS_RETRY_DELAY):
+    if max_cells <= 0:
+        raise ValueError(f"Cells per request must be positive, got {max_cells}")
+
+    try:
+        credential = Credentials.from_service_account_file(
+            service_account_file, scopes=scopes)
+        service = build('sheets', 'v4', credentials=credential)
+        values_api = service.spreadsheets().values()
+
+        # Read the sheet back once and only send the rows that differ from it
+        current = _execute_with_retries(values_api.get(
+            spreadsheetId=spreadsheet_id,
+            range=sheet_name,
+            valueRenderOption='UNFORMATTED_VALUE'
+        ), max_attempts, retry_delay).get('values', [])
+
+        desired = [[_sheet_value(value) for value in row]
+                   for row in [df.columns.tolist()] + df.values.tolist()]
+        width = max([len(row) for row in current + desired] or [1])
+        blocks = _changed_row_blocks(current, desired, width)
+
+        requests_sent, updated_cells = _write_row_blocks(
+            values_api, spreadsheet_id, blocks, sheet_name, width, max_cells,
+            min_interval, max_attempts, retry_delay)
+
+        changed_rows = sum(len(rows) for _, rows in blocks)
+        print(f"Synced Google Sheets: {changed_rows} changed rows in {requests_sent} requests")
+        return {'changed_rows': changed_rows, 'requests': requests_sent,
+                'updated_cells': updated_cells}
+
+    except Exception as e:
+        raise ValueError(f"Error syncing to Google Sheets: {str(e)}")
+
+
+def upsert_to_google_sheets(df, service_account_file, spreadsheet_id, scopes, key='Title',
+                            sheet_name='Sheet1', max_cells=SHEETS_MAX_CELLS_PER_REQUEST,
+                            min_interval=SHEETS_MIN_REQUEST_INTERVAL, max_attempts=5,
+                            retry_delay=SHEETS_RETRY_DELAY):
+    if key not in df.columns:
+        raise ValueError(f"Cannot upsert to Google Sheets, missing key column: {key}")
+    if max_cells <= 0:
+        raise ValueError(f"Cells per request must be positive, got {max_cells}")
+
+    try:
+        credential = Credentials.from_service_account_file(
+            service_account_file, scopes=scopes)
+        service = build('sheets', 'v4', credentials=credential)
+        values_api = service.spreadsheets().values()
+
+        current = _execute_with_retries(values_api.get(
+            spreadsheetId=spreadsheet_id,
+            range=sheet_name,
+            valueRenderOption='UNFORMATTED_VALUE'
+        ), max_attempts, retry_delay).get('values', [])
+
+        # Rows follow the sheet's own header, so a changed product is
+        # rewritten where it already is and only new products are appended
+        header = current[0] if current else df.columns.tolist()
+        if key not in header:
+            raise ValueError(f"Sheet {sheet_name} has no {key} column")
+        key_index = header.index(key)
+        positions = {row[key_index]: index for index, row in enumerate(current[1:], start=1)
+                     if len(row) > key_index}
+
+        desired = [list(row) for row in current] or [list(header)]
+        updated_rows = 0
+        for row in df.reindex(columns=header).values.tolist():
+            values = [_sheet_value(value) for value in row]
+            index = positions.get(values[key_index])
+            if index is None:
+                positions[values[key_index]] = len(desired)
+                desired.append(values)
+            else:
+                desired[index] = values
+                updated_rows += 1
+
+        width = max(len(row) for row in current + desired)
+        blocks = _changed_row_blocks(current, desired, width)
+        requests_sent, updated_cells = _write_row_blocks(
+            values_api, spreadsheet_id, blocks, sheet_name, width, max_cells,
+            min_interval, max_attempts, retry_delay)
+
+        appended_rows = len(df) - updated_rows
+        print(f"Upserted to Google Sheets: {updated_rows} updated and {appended_rows} appended "
+              f"rows in {requests_sent} requests")
+        return {'updated_rows': updated_rows, 'appended_rows': appended_rows,
+                'requests': requests_sent, 'updated_cells': updated_cells}
+
+    except Exception as e:
+        raise ValueError(f"Error upserting to Google Sheets: {str(e)}")
+
+
+def get_engine(db_url, pool_size=DEFAULT_DB_POOL_SIZE, max_overflow=DEFAULT_DB_MAX_OVERFLOW,
+               pool_pre_ping=True, pool_timeout=30):
+    # One engine per URL, so repeated and chunked loads check out warm
+    # connections instead of paying for a new pool and login every time
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is not None:
+            return engine
+
+        engine = create_engine(db_url, pool_size=pool_size, max_overflow=max_overflow,
+                               pool_pre_ping=pool_pre_ping, pool_timeout=pool_timeout)
+        stats = {"checkouts": 0, "connects": 0, "waits": 0,
+                 "limit": pool_size + max_overflow}
+
+        def count_connect(dbapi_connection, connection_record):
+            with _engines_lock:
+                stats["connects"] += 1
+
+        def count_checkout(dbapi_connection, connection_record, connection_proxy):
+            with _engines_lock:
+                stats["checkouts"] += 1
+
+        event.listen(engine.pool, "connect", count_connect)
+        event.listen(engine.pool, "checkout", count_checkout)
+
+        _engines[db_url] = engine
+        _engine_stats[engine] = stats
+        return engine
+
+
+def _checkout(engine, begin=False):
+    stats = _engine_stats.get(engine)
+    if stats is not None:
+        pool = engine.pool
+        # Every pooled connection is busy, so this checkout blocks until one is returned
+        if pool.checkedin() == 0 and pool.checkedout() >= stats["limit"]:
+            with _engines_lock:
+                stats["waits"] += 1
+
+    return engine.begin() if begin else engine.connect()
+
+
+def pool_stats(db_url):
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            raise ValueError("No engine has been created for this database URL")
+        stats = dict(_engine_stats[engine])
+
+    stats.pop("limit")
+    stats["pool_size"] = engine.pool.size()
+    stats["checked_out"] = engine.pool.checkedout()
+    stats["idle"] = engine.pool.checkedin()
+    return stats
+
+
+def dispose_engines():
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _engine_stats.clear()
+
+    for engine in engines:
+        engine.dispose()
+    return len(engines)
+
+
 def save_to_postgresql(df, db_url, table_name):
     try:
-        engine = create_engine(db_url)
+        engine = get_engine(db_url)
 
-        with engine.connect() as con:
+        with _checkout(engine) as con:
             df.to_sql(table_name, con=con,
                       if_exists='append', index=False)
             print("Data saved to PostgreSQL")
 
     except Exception as e:
         raise ValueError(f"Error saving to PostgreSQL: {str(e)}")
+
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def save_to_postgresql_copy(df, db_url, table_name, batch_size=50000):
+    if df.empty:
+        raise ValueError("No data to save to PostgreSQL")
+
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError(f"Batch size must be a positive integer, got {batch_size}")
+
+    if table_name.count('.') > 1:
+        raise ValueError(f"Table name must be 'table' or 'schema.table', got '{table_name}'")
+    # to_sql would create a table literally named "schema.table", so the schema goes separately
+    schema, _, table_name = table_name.rpartition('.')
+    schema = schema or None
+
+    try:
+        engine = get_engine(db_url)
+        table = '.'.join(_quote_identifier(part) for part in (schema, table_name) if part)
+        columns = ', '.join(_quote_identifier(col) for col in df.columns)
+        copy_sql = (f"COPY {table} ({columns}) FROM STDIN "
+                    f"WITH (FORMAT csv, NULL '\\N')")
+
+        start = time.perf_counter()
+
+        # Table creation and every COPY batch share one transaction, so a
+        # failure part-way through leaves the table untouched
+        with _checkout(engine, begin=True) as con:
+            # Let pandas create a missing table with the same schema to_sql would
+            df.head(0).to_sql(table_name, con=con, schema=schema, if_exists='append', index=False)
+
+            cursor = con.connection.cursor()
+            for offset in range(0, len(df), batch_size):
+                buffer = io.StringIO()
+                df.iloc[offset:offset + batch_size].to_csv(
+                    buffer, header=False, index=False, na_rep='\\N')
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+
+        elapsed = time.perf_counter() - start
+        rows_per_sec = len(df) / elapsed if elapsed > 0 else float('inf')
+        print(f"Data saved to PostgreSQL via COPY: {len(df)} rows in {elapsed:.2f}s "
+              f"({rows_per_sec:,.0f} rows/sec)")
+
+        return {'rows': len(df), 'seconds': elapsed, 'rows_per_sec': rows_per_sec}
+
+    except Exception as e:
+        raise ValueError(f"Error saving to PostgreSQL: {str(e)}")
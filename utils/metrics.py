@@ -0,0 +1,133 @@
+from contextlib import contextmanager
+import json
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+METRIC_PREFIX = "fashion_etl"
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _atomic_write_text(path, text):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample_value(value):
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    return repr(float(value))
+
+
+class RunMetrics:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        # Disabled metrics cost one generator step per stage and nothing else
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            entry = self.stages.setdefault(name, {})
+            entry["seconds"] = time.perf_counter() - start
+            entry["success"] = status == "ok"
+            rss = peak_rss_bytes()
+            if rss is not None:
+                entry["peak_rss_bytes"] = rss
+
+    def record(self, name, **values):
+        if self.enabled:
+            self.stages.setdefault(name, {}).update(values)
+
+    def report(self):
+        return {
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "success": all(stage.get("success", True) for stage in self.stages.values()),
+            "stages": self.stages
+        }
+
+    def write_json(self, path):
+        if not self.enabled:
+            return
+        try:
+            _atomic_write_text(path, json.dumps(self.report(), indent=2, sort_keys=True))
+        except OSError as e:
+            raise ValueError(f"Error writing run report to {path}: {str(e)}")
+
+    def prometheus_text(self):
+        report = self.report()
+        samples = {}
+
+        # Every numeric stage value becomes a gauge labelled by stage; dict
+        # values (such as rows dropped per reason) add a second label
+        for stage, values in report["stages"].items():
+            for key, value in values.items():
+                name = f"{METRIC_PREFIX}_stage_{key}"
+                if isinstance(value, dict):
+                    label = "reason" if key.startswith("rows_dropped") else "name"
+                    for sub_key, sub_value in value.items():
+                        labels = f'stage="{_label_value(stage)}",{label}="{_label_value(sub_key)}"'
+                        samples.setdefault(name, []).append((labels, sub_value))
+                elif isinstance(value, (bool, int, float)):
+                    samples.setdefault(name, []).append((f'stage="{_label_value(stage)}"', value))
+
+        lines = []
+        for name in sorted(samples):
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples[name]:
+                lines.append(f"{name}{{{labels}}} {_sample_value(value)}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_success gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_success {int(report['success'])}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {report['finished_at']:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # node_exporter's textfile collector reads whole files, so the report is
+        # renamed into place and never seen half-written
+        if not self.enabled:
+            return
+        try:
+            _atomic_write_text(path, self.prometheus_text())
+        except OSError as e:
+            raise ValueError(f"Error writing Prometheus metrics to {path}: {str(e)}")
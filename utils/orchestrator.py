@@ -0,0 +1,86 @@
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+import threading
+import time
+
+
+def _run_sink(sink, df):
+    start = time.perf_counter()
+    result = sink(df)
+    return result, time.perf_counter() - start
+
+
+def _start_sink(name, sink, df):
+    # A daemon thread rather than a pool worker: Python cannot stop a running
+    # thread, and the interpreter joins pool workers at exit, so a sink that
+    # timed out would otherwise hold the process open until it finished
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(_run_sink(sink, df))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"sink-{name}", daemon=True).start()
+    return future
+
+
+def run_sinks(df, sinks, timeouts=None, continue_on_error=False, on_result=None):
+    if not sinks:
+        raise ValueError("No load sinks configured")
+
+    timeouts = timeouts or {}
+    unknown = set(timeouts) - set(sinks)
+    if unknown:
+        raise ValueError(f"Timeouts given for unknown sinks: {', '.join(sorted(unknown))}")
+
+    start = time.monotonic()
+    deadlines = {name: start + timeouts[name] for name in sinks if timeouts.get(name) is not None}
+    results = {}
+
+    # Sinks are I/O bound, so threads overlap them and the load takes about as
+    # long as the slowest one. Each gets a shallow copy: the data is shared, but
+    # a sink adding or dropping columns cannot affect the others
+    pending = {_start_sink(name, sink, df.copy(deep=False)): name
+               for name, sink in sinks.items()}
+
+    while pending:
+        now = time.monotonic()
+        waiting_deadlines = [deadlines[name] for name in pending.values() if name in deadlines]
+        wait_for = max(0, min(waiting_deadlines) - now) if waiting_deadlines else None
+        done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name = pending.pop(future)
+            try:
+                result, seconds = future.result()
+                results[name] = {'status': 'ok', 'seconds': seconds, 'result': result}
+                print(f"Sink {name} finished in {seconds:.2f}s")
+            except Exception as e:
+                results[name] = {'status': 'failed', 'seconds': time.monotonic() - start,
+                                 'error': str(e)}
+                print(f"Sink {name} failed: {str(e)}")
+            if on_result is not None:
+                on_result(name, results[name])
+
+        now = time.monotonic()
+        for future, name in list(pending.items()):
+            if name in deadlines and now >= deadlines[name]:
+                # A running thread cannot be stopped; it is abandoned and its
+                # outcome ignored. Whatever it still writes lands after this report
+                del pending[future]
+                results[name] = {'status': 'timeout', 'seconds': now - start,
+                                 'error': f"timed out after {timeouts[name]}s"}
+                print(f"Sink {name} timed out after {timeouts[name]}s")
+                if on_result is not None:
+                    on_result(name, results[name])
+
+        failed = [name for name, outcome in results.items() if outcome['status'] != 'ok']
+        if failed and not continue_on_error:
+            raise ValueError(f"Load failed for sink(s) {', '.join(sorted(failed))}: "
+                             f"{results[failed[0]]['error']}")
+
+    succeeded = sum(outcome['status'] == 'ok' for outcome in results.values())
+    print(f"Loaded into {succeeded}/{len(sinks)} sinks in {time.monotonic() - start:.2f}s")
+    return {name: results[name] for name in sinks}
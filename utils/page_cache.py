@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class PageCache:
+    def __init__(self, cache_dir, ttl=None, max_bytes=None):
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"Cache TTL must be positive, got {ttl}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"Cache size limit must be positive, got {max_bytes}")
+
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.refs_dir = os.path.join(cache_dir, "refs")
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _ref_path(self, url):
+        return os.path.join(self.refs_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _atomic_write(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_ref(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_expired(self, ref, now=None):
+        if self.ttl is None:
+            return False
+        return (now or time.time()) - ref["fetched_at"] > self.ttl
+
+    def get(self, url, allow_stale=False):
+        ref = self._read_ref(self._ref_path(url))
+        if ref is None or ref.get("url") != url:
+            return None
+        if not allow_stale and self._is_expired(ref):
+            return None
+
+        try:
+            with open(self._object_path(ref["sha256"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, url, content):
+        try:
+            # Pages are stored by content hash, so identical bodies behind
+            # different URLs (or repeat runs) share a single object
+            digest = hashlib.sha256(content).hexdigest()
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                self._atomic_write(object_path, content)
+
+            ref = {
+                "url": url,
+                "sha256": digest,
+                "size": len(content),
+                "fetched_at": time.time()
+            }
+            self._atomic_write(self._ref_path(url), json.dumps(ref).encode("utf-8"))
+        except OSError as e:
+            raise ValueError(f"Error writing {url} to page cache: {str(e)}")
+
+    def touch(self, url):
+        # The origin confirmed the cached body is still current (304), so its TTL restarts
+        path = self._ref_path(url)
+        ref = self._read_ref(path)
+        if ref is None or ref.get("url") != url:
+            return False
+        ref["fetched_at"] = time.time()
+        try:
+            self._atomic_write(path, json.dumps(ref).encode("utf-8"))
+        except OSError as e:
+            raise ValueError(f"Error writing {url} to page cache: {str(e)}")
+        return True
+
+    def evict(self):
+        now = time.time()
+        refs = []
+        removed = 0
+
+        for name in os.listdir(self.refs_dir):
+            path = os.path.join(self.refs_dir, name)
+            ref = self._read_ref(path)
+            if ref is None or self._is_expired(ref, now):
+                os.remove(path)
+                removed += 1
+            else:
+                refs.append((path, ref))
+
+        # Keep the most recently fetched pages until the size budget is spent
+        refs.sort(key=lambda item: item[1]["fetched_at"], reverse=True)
+        kept_objects = set()
+        total_bytes = 0
+        for path, ref in refs:
+            digest = ref["sha256"]
+            if digest in kept_objects:
+                continue
+            if self.max_bytes is not None and total_bytes + ref["size"] > self.max_bytes:
+                os.remove(path)
+                removed += 1
+                continue
+            kept_objects.add(digest)
+            total_bytes += ref["size"]
+
+        # Drop objects no URL points at any more
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in kept_objects:
+                    os.remove(os.path.join(prefix_dir, digest))
+
+        return removed
+
+    def size(self):
+        total = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                total += os.path.getsize(os.path.join(prefix_dir, digest))
+        return total
@@ -0,0 +1,206 @@
+from datetime import datetime
+import sqlite3
+
+import pandas as pd
+
+# Fixed-width timestamps compare as strings in the same order as the times they hold
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# Observations are clustered on (product_id, observed_at), so one product's
+# series is a single index range scan however many rows the store holds
+SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS products (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL UNIQUE,
+        latest_price REAL,
+        latest_observed_at TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        recorded_at TEXT NOT NULL,
+        source TEXT,
+        observations INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE TABLE IF NOT EXISTS price_observations (
+        product_id INTEGER NOT NULL REFERENCES products (id),
+        observed_at TEXT NOT NULL,
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        price REAL NOT NULL,
+        rating REAL,
+        PRIMARY KEY (product_id, observed_at)
+    ) WITHOUT ROWID''',
+    "CREATE INDEX IF NOT EXISTS idx_price_observations_run ON price_observations (run_id, product_id)"
+)
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime(TIMESTAMP_FORMAT)
+
+
+class PriceHistory:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        try:
+            # Autocommit mode, so every write below opens its own transaction
+            self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+        except sqlite3.Error as e:
+            raise ValueError(f"Error opening price history {db_path}: {str(e)}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def record_run(self, df, recorded_at=None, source=None, run_id=None):
+        missing = [col for col in ('Title', 'Price') if col not in df.columns]
+        if missing:
+            raise ValueError(f"Cannot record prices, missing columns: {', '.join(missing)}")
+
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        if 'timestamp' in df.columns:
+            observed = pd.to_datetime(df['timestamp'], format='ISO8601').dt.strftime(TIMESTAMP_FORMAT)
+        else:
+            observed = pd.Series(_timestamp(recorded_at) or now, index=df.index)
+        # A run is dated by its scrape, so backfilled snapshots slot in where they belong
+        recorded_at = _timestamp(recorded_at) or (observed.min() if len(observed) else now)
+
+        prices = pd.to_numeric(df['Price'], errors='coerce')
+        ratings = (pd.to_numeric(df['Rating'], errors='coerce') if 'Rating' in df.columns
+                   else pd.Series(float('nan'), index=df.index))
+        priced = prices.notna()
+        # None rather than NaN, so a missing rating is stored as NULL
+        rows = list(zip(df['Title'][priced], observed[priced], prices[priced],
+                        ratings[priced].astype(object).where(ratings[priced].notna(), None)))
+
+        conn = self._conn
+        try:
+            conn.execute("BEGIN")
+            # A streaming run records its chunks one at a time into the same run
+            new_run = run_id is None
+            if new_run:
+                run_id = conn.execute("INSERT INTO runs (recorded_at, source) VALUES (?, ?)",
+                                      (recorded_at, source)).lastrowid
+            elif conn.execute("SELECT 1 FROM runs WHERE id = ?", (run_id,)).fetchone() is None:
+                raise ValueError(f"Unknown price history run {run_id}")
+
+            # Stage the run once, then let SQLite resolve product ids in bulk
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS staged_prices "
+                         "(title TEXT, observed_at TEXT, price REAL, rating REAL)")
+            conn.execute("DELETE FROM staged_prices")
+            conn.executemany("INSERT INTO staged_prices VALUES (?, ?, ?, ?)", rows)
+
+            conn.execute("INSERT OR IGNORE INTO products (title) SELECT DISTINCT title FROM staged_prices")
+            # Append-only: re-recording the same scrape adds nothing
+            inserted = conn.execute('''
+                INSERT OR IGNORE INTO price_observations (product_id, observed_at, run_id, price, rating)
+                SELECT p.id, s.observed_at, ?, s.price, s.rating
+                FROM staged_prices s JOIN products p ON p.title = s.title
+            ''', (run_id,)).rowcount
+            if inserted:
+                conn.execute("UPDATE runs SET observations = observations + ? WHERE id = ?",
+                             (inserted, run_id))
+            elif new_run:
+                conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+            # Keep each product's newest price on the product row for latest_prices()
+            conn.execute('''
+                UPDATE products SET latest_price = newest.price, latest_observed_at = newest.observed_at
+                FROM (
+                    SELECT title, price, MAX(observed_at) AS observed_at
+                    FROM staged_prices GROUP BY title
+                ) AS newest
+                WHERE products.title = newest.title
+                  AND (products.latest_observed_at IS NULL
+                       OR newest.observed_at >= products.latest_observed_at)
+            ''')
+            conn.execute("COMMIT")
+        except (sqlite3.Error, ValueError) as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise ValueError(f"Error recording price history: {str(e)}")
+
+        if not inserted:
+            print("No new price observations to record")
+            return None if new_run else run_id
+        print(f"Recorded {inserted} price observations in run {run_id}")
+        return run_id
+
+    def _query(self, sql, params, columns):
+        try:
+            return pd.DataFrame(self._conn.execute(sql, params).fetchall(), columns=columns)
+        except sqlite3.Error as e:
+            raise ValueError(f"Price history query error: {str(e)}")
+
+    def runs(self):
+        return self._query("SELECT id, recorded_at, source, observations FROM runs "
+                           "ORDER BY recorded_at, id",
+                           (), ['run_id', 'recorded_at', 'source', 'observations'])
+
+    def price_series(self, title, start=None, end=None):
+        # Timestamps are stored as ISO strings, which sort like the times they hold
+        conditions = ["p.title = ?"]
+        params = [title]
+        if start is not None:
+            conditions.append("o.observed_at >= ?")
+            params.append(_timestamp(start))
+        if end is not None:
+            conditions.append("o.observed_at <= ?")
+            params.append(_timestamp(end))
+
+        return self._query(f'''
+            SELECT o.observed_at, o.price, o.rating, o.run_id
+            FROM products p JOIN price_observations o ON o.product_id = p.id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY o.observed_at
+        ''', params, ['observed_at', 'price', 'rating', 'run_id'])
+
+    def latest_prices(self):
+        return self._query('''
+            SELECT title, latest_price, latest_observed_at FROM products
+            WHERE latest_price IS NOT NULL ORDER BY title
+        ''', (), ['title', 'price', 'observed_at'])
+
+    def biggest_changes(self, from_run=None, to_run=None, limit=10):
+        if from_run is None or to_run is None:
+            # Default to the two most recent scrapes
+            run_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM runs ORDER BY recorded_at DESC, id DESC LIMIT 2")]
+            if len(run_ids) < 2:
+                raise ValueError("Price changes need at least two recorded runs")
+            to_run = run_ids[0] if to_run is None else to_run
+            from_run = run_ids[1] if from_run is None else from_run
+
+        # Within a run SQLite takes price from the row holding MAX(observed_at)
+        return self._query('''
+            WITH before AS (
+                SELECT product_id, price, MAX(observed_at) FROM price_observations
+                WHERE run_id = ? GROUP BY product_id
+            ), after AS (
+                SELECT product_id, price, MAX(observed_at) FROM price_observations
+                WHERE run_id = ? GROUP BY product_id
+            )
+            SELECT p.title, before.price, after.price, after.price - before.price,
+                   (after.price - before.price) / NULLIF(before.price, 0)
+            FROM before JOIN after USING (product_id) JOIN products p ON p.id = product_id
+            WHERE after.price != before.price
+            ORDER BY ABS(after.price - before.price) DESC, p.title
+            LIMIT ?
+        ''', (from_run, to_run, limit),
+            ['title', 'old_price', 'new_price', 'change', 'change_ratio'])
+
+
+def record_prices(df, db_path):
+    # Load sink entry point, registered as "price_history" in utils/sinks.py
+    with PriceHistory(db_path) as history:
+        return history.record_run(df)
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+import cProfile
+import os
+import threading
+import tracemalloc
+
+DEFAULT_TOP_ALLOCATIONS = 25
+
+# tracemalloc is process-wide; stages running on several threads share one
+# tracing session that stops when the last of them finishes
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _start_tracing():
+    global _tracing_users, _started_tracing
+
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _started_tracing
+
+    with _tracing_lock:
+        _tracing_users -= 1
+        # Leave tracing alone if someone else had already turned it on
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+class StageProfiler:
+    def __init__(self, output_dir, stages=None, top_allocations=DEFAULT_TOP_ALLOCATIONS):
+        self.output_dir = output_dir
+        self.stages = set(stages) if stages is not None else None
+        self.top_allocations = top_allocations
+        self.outputs = {}
+
+    def enabled_for(self, name):
+        # Selecting "load" also covers the per-sink stages such as "load_postgresql"
+        if self.stages is None:
+            return True
+        return any(name == stage or name.startswith(stage + "_") for stage in self.stages)
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled_for(name):
+            yield
+            return
+
+        _start_tracing()
+        baseline = tracemalloc.take_snapshot()
+        # cProfile only sees the thread that enables it, which is why sinks
+        # running on worker threads are wrapped individually
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process, so a stage
+            # nested in another profiled stage only gets allocation tracking
+            profiler = None
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            _stop_tracing()
+            self._write(name, profiler, snapshot, baseline, peak)
+
+    def wrap(self, name, func):
+        if not self.enabled_for(name):
+            return func
+
+        def profiled(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return profiled
+
+    def _write(self, name, profiler, snapshot, baseline, peak):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profile_path = None
+            if profiler is not None:
+                profile_path = os.path.join(self.output_dir, f"{name}.prof")
+                profiler.dump_stats(profile_path)
+
+            # Growth per source line between the start and the end of the stage
+            ignored = [tracemalloc.Filter(False, tracemalloc.__file__),
+                       tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                       tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+            changes = snapshot.filter_traces(ignored).compare_to(
+                baseline.filter_traces(ignored), "lineno")
+
+            allocations_path = os.path.join(self.output_dir, f"{name}_allocations.txt")
+            with open(allocations_path, "w", encoding="utf-8") as f:
+                f.write(f"Stage {name}: peak traced memory {peak / 1024:.1f} KiB\n")
+                f.write(f"Top {self.top_allocations} allocation sites by growth during the stage:\n")
+                for stat in changes[:self.top_allocations]:
+                    frame = stat.traceback[0]
+                    f.write(f"{stat.size_diff / 1024:>12.1f} KiB {stat.count_diff:>+9} blocks  "
+                            f"{frame.filename}:{frame.lineno}\n")
+
+            self.outputs[name] = {"profile": profile_path, "allocations": allocations_path}
+            print(f"Profile for stage {name} written to {profile_path or allocations_path}")
+
+        except OSError as e:
+            raise ValueError(f"Error writing profile for stage {name}: {str(e)}")
@@ -0,0 +1,100 @@
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+
+THROTTLE_STATUSES = {429, 503}
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 30.0
+
+
+def parse_retry_after(value, now=None):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(retry_at - (now if now is not None else time.time()), 0.0)
+
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF_BASE, cap=DEFAULT_BACKOFF_CAP):
+    # "Full jitter": a random wait up to the exponential bound, so workers that
+    # failed together do not all retry together
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate=5.0, burst=None, min_rate=0.5, max_rate=50.0,
+                 target_latency=1.0, increase=0.5, decrease=0.5,
+                 clock=time.monotonic, sleep=time.sleep):
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                f"Rate must satisfy 0 < min_rate <= rate <= max_rate, got {min_rate}, {rate}, {max_rate}")
+        if not 0 < decrease < 1:
+            raise ValueError(f"Decrease factor must be between 0 and 1, got {decrease}")
+
+        self.rate = rate
+        # Without an explicit burst the bucket holds about one second of requests
+        self._fixed_burst = burst
+        self.burst = burst or max(1.0, rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _resize_burst(self):
+        # Follows the rate both ways, so a recovered server gets its burst back
+        if not self._fixed_burst:
+            self.burst = max(1.0, self.rate)
+
+    def acquire(self):
+        # Every fetch worker takes a token from the same bucket, so the rate
+        # applies to the crawl as a whole rather than per thread
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def record_success(self, latency):
+        # Additive increase while the server keeps up, multiplicative decrease
+        # as soon as it slows down
+        with self._lock:
+            if latency <= self.target_latency:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            else:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._resize_burst()
+
+    def record_throttled(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._resize_burst()
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
@@ -0,0 +1,63 @@
+from importlib import import_module
+import sys
+import threading
+
+# Sinks are registered by name as "module:function" targets and only imported
+# the first time they are used, so a run that writes CSV never loads the
+# database or Google API clients
+_sinks = {
+    'csv': 'utils.file_sinks:save_to_csv',
+    'parquet': 'utils.file_sinks:save_to_parquet',
+    'sqlite': 'utils.load:save_to_database',
+    'postgresql': 'utils.load:save_to_postgresql_copy',
+    'google_sheets': 'utils.load:sync_to_google_sheets',
+    'google_sheets_append': 'utils.load:append_to_google_sheets',
+    'google_sheets_upsert': 'utils.load:upsert_to_google_sheets',
+    'price_history': 'utils.price_history:record_prices'
+}
+_sinks_lock = threading.Lock()
+
+
+def register_sink(name, target):
+    # target is either a callable or a "module:function" string resolved on first use
+    if not callable(target) and (not isinstance(target, str) or ':' not in target):
+        raise ValueError(f"Sink '{name}' must be a callable or a 'module:function' string, got {target!r}")
+
+    with _sinks_lock:
+        _sinks[name] = target
+
+
+def available_sinks():
+    with _sinks_lock:
+        return sorted(_sinks)
+
+
+def get_sink(name):
+    with _sinks_lock:
+        target = _sinks.get(name)
+    if target is None:
+        raise ValueError(f"Unknown sink '{name}', expected one of {', '.join(available_sinks())}")
+    if callable(target):
+        return target
+
+    # After the first import this is a sys.modules lookup
+    module_name, _, attribute = target.partition(':')
+    try:
+        return getattr(import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Error loading sink '{name}' from {target}: {str(e)}")
+
+
+def bind_sink(name, *args, **kwargs):
+    # Defers the import until the sink is first called with a DataFrame
+    def sink(df):
+        return get_sink(name)(df, *args, **kwargs)
+    return sink
+
+
+def dispose_sinks():
+    # Connection pools only exist if a database sink was loaded; never import
+    # one just to close it
+    load = sys.modules.get('utils.load')
+    if load is not None:
+        load.dispose_engines()
@@ -1,7 +1,26 @@
+import numpy as np
 import pandas as pd
 import re
+from pandas.api.types import infer_dtype, is_object_dtype, is_string_dtype
 from datetime import datetime
 
+# Define dirty patterns
+INVALID_PATTERNS = {
+    "Title": ["Unknown Product"],
+    "Rating": ["Invalid Rating / 5", "Not Rated"],
+    "Price": ["Price Unavailable", None]
+}
+
+PRICE_SYMBOLS_PATTERN = re.compile(r"[$,]")
+RATING_VALUE_PATTERN = re.compile(r"([\d.]+)")
+COLORS_COUNT_PATTERN = re.compile(r"(\d+)")
+
+# Patterns used by the vectorized transform_data kernels
+PRICE_NON_NUMERIC_PATTERN = re.compile(r"[^\d.]")
+DECIMAL_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d*)?|\.\d+")
+RATING_NUMBER_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+LIST_SEPARATOR_PATTERN = re.compile(r"\s*,\s*")
+
 
 def create_dataframe(input_data):
     try:
@@ -15,7 +34,50 @@ def create_dataframe(input_data):
         raise ValueError(f"Error converting data to DataFrame: {str(e)}")
 
 
-def process_dataframe(df, conversion_rate):
+def _plain_strings(series):
+    # Object columns holding nothing but str can skip the pandas string
+    # accessor; anything else keeps the accessor so mixed values behave as before
+    return series.dtype == object and infer_dtype(series, skipna=False) == "string"
+
+
+def _map_distinct(series, convert):
+    # Scraped columns repeat a small set of distinct strings (sizes, genders,
+    # ratings, most prices), so convert each distinct value once and
+    # broadcast the results back through the factorized codes
+    codes, uniques = pd.factorize(series.to_numpy())
+    converted = convert(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(converted.take(codes), index=series.index, name=series.name)
+
+
+def _extract_first(values, pattern):
+    search = pattern.search
+    extracted = []
+    for value in values:
+        match = search(value)
+        extracted.append(match.group(1) if match else np.nan)
+    return pd.Series(extracted, index=values.index, dtype=object)
+
+
+def count_dropped_rows(df):
+    # Attribute each row process_dataframe drops to the first reason that
+    # applies, in the order its mask checks them, so the counts add up
+    remaining = df.notna().all(axis=1)
+    dropped = {"missing_values": int((~remaining).sum())}
+
+    duplicated = df.duplicated() & remaining
+    dropped["duplicates"] = int(duplicated.sum())
+    remaining &= ~duplicated
+
+    for col, invalid_values in INVALID_PATTERNS.items():
+        if col in df.columns:
+            invalid = df[col].isin(invalid_values) & remaining
+            dropped[f"invalid_{col.lower()}"] = int(invalid.sum())
+            remaining &= ~invalid
+
+    return dropped
+
+
+def process_dataframe(df, conversion_rate, copy=True):
     try:
         # Input validation
         if not isinstance(df, pd.DataFrame):
@@ -29,58 +91,74 @@ def process_dataframe(df, conversion_rate):
             raise ValueError(
                 f"Exchange rate must be positive, got {conversion_rate}")
 
-        # Create a copy to avoid modifying the original DataFrame
-        processed_df = df.copy()
-
-        # Define dirty patterns
-        invalid_patterns = {
-            "Title": ["Unknown Product"],
-            "Rating": ["Invalid Rating / 5", "Not Rated"],
-            "Price": ["Price Unavailable", None]
-        }
-
-        # Drop rows with missing values and duplicates
+        # Build one validity mask covering missing values, duplicates and
+        # dirty patterns, then filter the frame a single time
         try:
-            processed_df.dropna(inplace=True)
-            processed_df.drop_duplicates(inplace=True)
+            valid = df.notna().all(axis=1) & ~df.duplicated()
         except Exception as e:
             raise ValueError(f"Failed to drop rows with missing values: {str(e)}")
 
-        # Remove rows with dirty patterns
-        for col, invalid_values in invalid_patterns.items():
-            if col in processed_df.columns:
-                processed_df = processed_df[~processed_df[col].isin(invalid_values)]
+        for col, invalid_values in INVALID_PATTERNS.items():
+            if col in df.columns:
+                valid &= ~df[col].isin(invalid_values)
+
+        # Filtering already yields a new frame; with copy=False a frame with
+        # nothing to drop is transformed in place instead of being duplicated
+        if copy or not valid.all():
+            processed_df = df.take(np.flatnonzero(valid.to_numpy()))
+        else:
+            processed_df = df
 
         # Transform Price column
         try:
-            processed_df["Price"] = processed_df["Price"].str.replace(
-                r"[$,]", "", regex=True).astype(float).mul(conversion_rate).round(2)
+            prices = processed_df["Price"]
+            if _plain_strings(prices):
+                strip = PRICE_SYMBOLS_PATTERN.sub
+                prices = _map_distinct(prices, lambda values: pd.Series(
+                    [strip("", value) for value in values], dtype=object).astype(float))
+            else:
+                prices = prices.str.replace(
+                    PRICE_SYMBOLS_PATTERN, "", regex=True).astype(float)
+            processed_df["Price"] = prices.mul(conversion_rate).round(2)
         except Exception as e:
             raise ValueError(
                 f"Failed to process Price column - check for missing or invalid values: {str(e)}")
 
         # Transform Rating column
         try:
-            processed_df["Rating"] = processed_df["Rating"].str.extract(
-                r"([\d.]+)").astype(float)
+            ratings = processed_df["Rating"]
+            if _plain_strings(ratings):
+                processed_df["Rating"] = _map_distinct(ratings, lambda values: _extract_first(
+                    values, RATING_VALUE_PATTERN).astype(float))
+            else:
+                processed_df["Rating"] = ratings.str.extract(
+                    RATING_VALUE_PATTERN, expand=False).astype(float)
         except Exception as e:
             raise ValueError(
                 f"Failed to process Rating column - check for missing or invalid formats: {str(e)}")
 
         # Transform Colors column
         try:
-            processed_df["Colors"] = processed_df["Colors"].str.extract(
-                r"(\d+)").astype(int)
+            colors = processed_df["Colors"]
+            if _plain_strings(colors):
+                processed_df["Colors"] = _map_distinct(colors, lambda values: _extract_first(
+                    values, COLORS_COUNT_PATTERN).astype(int))
+            else:
+                processed_df["Colors"] = colors.str.extract(
+                    COLORS_COUNT_PATTERN, expand=False).astype(int)
         except Exception as e:
             raise ValueError(
                 f"Failed to process Colors column - check for missing or invalid formats: {str(e)}")
 
         # Transform Size and Gender columns
         try:
-            processed_df["Size"] = processed_df["Size"].str.replace(
-                "Size: ", "", regex=False)
-            processed_df["Gender"] = processed_df["Gender"].str.replace(
-                "Gender: ", "", regex=False)
+            for col, prefix in (("Size", "Size: "), ("Gender", "Gender: ")):
+                values = processed_df[col]
+                if _plain_strings(values):
+                    processed_df[col] = _map_distinct(
+                        values, lambda uniques: uniques.str.replace(prefix, "", regex=False))
+                else:
+                    processed_df[col] = values.str.replace(prefix, "", regex=False)
         except Exception as e:
             raise ValueError(
                 f"Failed to process Size or Gender columns - check for missing values: {str(e)}")
@@ -96,6 +174,41 @@ def process_dataframe(df, conversion_rate):
         raise ValueError(f"Unexpected error in transform_data: {str(e)}")
 
 
+def iter_dataframe_chunks(pages, chunk_size):
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError(f"Chunk size must be a positive integer, got {chunk_size}")
+
+    # Regroup per-page product lists into fixed-size frames so memory is
+    # bounded by chunk_size rather than by the catalog
+    buffer = []
+    for products in pages:
+        buffer.extend(products)
+        while len(buffer) >= chunk_size:
+            yield create_dataframe(buffer[:chunk_size])
+            del buffer[:chunk_size]
+
+    if buffer:
+        yield create_dataframe(buffer)
+
+
+def process_dataframe_chunks(chunks, conversion_rate):
+    # Rows already seen in an earlier chunk are dropped up front, so the
+    # combined output matches process_dataframe over the concatenated input
+    seen_rows = set()
+
+    for chunk in chunks:
+        if not isinstance(chunk, pd.DataFrame):
+            raise ValueError("Data transformation failed: Input data must be a pandas DataFrame")
+
+        row_hashes = pd.util.hash_pandas_object(chunk, index=False)
+        is_new = ~row_hashes.isin(seen_rows) & ~row_hashes.duplicated()
+        seen_rows.update(row_hashes[is_new])
+
+        processed = process_dataframe(chunk[is_new.to_numpy()], conversion_rate)
+        if not processed.empty:
+            yield processed
+
+
 def clean_price(price_str):
     if not price_str:
         return None
@@ -158,6 +271,103 @@ def extract_gender(gender_str):
         return None
 
 
+# Vectorized column kernels. Each one matches Series.apply() over the
+# corresponding helper above, which stays the reference implementation.
+def _text_series(series):
+    # Columns of a non-text dtype (e.g. all values missing) have nothing to parse
+    if not (is_object_dtype(series.dtype) or is_string_dtype(series.dtype)):
+        return pd.Series(np.nan, index=series.index, dtype=object, name=series.name)
+    if infer_dtype(series, skipna=True) in ("string", "empty"):
+        return series
+
+    # Blank out non-string cells so the string accessor accepts the column
+    is_text = np.fromiter((isinstance(value, str) for value in series.to_numpy()),
+                          dtype=bool, count=len(series))
+    return series.where(is_text).astype(object)
+
+
+def _is_filled_text(text):
+    # The helpers bail out on "if not value", so only non-empty strings count
+    return text.str.len().gt(0).fillna(False).astype(bool)
+
+
+def _as_reference_scalars(values):
+    # apply() yields float64 as soon as one value parses, object Nones otherwise
+    if values.isna().all():
+        return pd.Series([None] * len(values), index=values.index, dtype=object,
+                         name=values.name)
+    return values
+
+
+def _per_distinct(series, kernel):
+    if series.dtype != object or infer_dtype(series, skipna=True) != "string":
+        return kernel(series)
+
+    # Run the kernel once per distinct string; missing cells are factorized
+    # to -1, which take() maps onto the trailing None entry
+    codes, uniques = pd.factorize(series.to_numpy())
+    distinct = pd.Series(list(uniques) + [None], dtype=object, name=series.name)
+    converted = kernel(distinct).to_numpy()
+    return pd.Series(converted.take(codes), index=series.index, name=series.name)
+
+
+def _clean_prices(series):
+    text = _text_series(series)
+    digits = text.str.replace(PRICE_NON_NUMERIC_PATTERN, "", regex=True)
+    parseable = _is_filled_text(text) & digits.str.fullmatch(
+        DECIMAL_NUMBER_PATTERN).eq(True)
+    return digits.where(parseable).astype(float)
+
+
+def _clean_ratings(series):
+    text = _text_series(series)
+    return text.str.extract(RATING_NUMBER_PATTERN, expand=False).astype(float)
+
+
+def _extract_after(series, marker):
+    text = _text_series(series)
+    values = text.str.split(marker, regex=False).str[-1].str.strip()
+    return text, values
+
+
+def _extract_list(series, marker):
+    text, values = _extract_after(series, marker)
+    items = values.str.split(LIST_SEPARATOR_PATTERN, regex=True)
+    filled = _is_filled_text(text)
+    return pd.Series([value if ok else [] for value, ok in zip(items, filled)],
+                     index=series.index, dtype=object, name=series.name)
+
+
+def _extract_scalar(series, marker):
+    text, values = _extract_after(series, marker)
+    return values.where(_is_filled_text(text), None)
+
+
+def clean_price_series(series):
+    return _as_reference_scalars(_per_distinct(series, _clean_prices))
+
+
+def clean_rating_series(series):
+    return _as_reference_scalars(_per_distinct(series, _clean_ratings))
+
+
+def extract_colors_series(series):
+    colors = _per_distinct(series, lambda values: _extract_list(values, 'Colors:'))
+    # Distinct values share one list object; give every row its own copy
+    return pd.Series([list(value) for value in colors], index=series.index,
+                     dtype=object, name=series.name)
+
+
+def extract_sizes_series(series):
+    sizes = _per_distinct(series, lambda values: _extract_list(values, 'Size:'))
+    return pd.Series([list(value) for value in sizes], index=series.index,
+                     dtype=object, name=series.name)
+
+
+def extract_gender_series(series):
+    return _per_distinct(series, lambda values: _extract_scalar(values, 'Gender:'))
+
+
 def transform_data(data):
     if not data:
         raise ValueError("No data provided for transformation")
@@ -167,11 +377,11 @@ def transform_data(data):
         df = pd.DataFrame(data)
 
         # Apply transformations
-        df['Price'] = df['Price'].apply(clean_price)
-        df['Rating'] = df['Rating'].apply(clean_rating)
-        df['Colors'] = df['Colors'].apply(extract_colors)
-        df['Size'] = df['Size'].apply(extract_sizes)
-        df['Gender'] = df['Gender'].apply(extract_gender)
+        df['Price'] = clean_price_series(df['Price'])
+        df['Rating'] = clean_rating_series(df['Rating'])
+        df['Colors'] = extract_colors_series(df['Colors'])
+        df['Size'] = extract_sizes_series(df['Size'])
+        df['Gender'] = extract_gender_series(df['Gender'])
 
         # Convert timestamp to datetime
         df['timestamp'] = pd.to_datetime(df['timestamp'])